@@ -8,6 +8,16 @@
  *                                                                         *
  ***************************************************************************/
 """
+import time
+
+
 def classFactory(iface):
+    start = time.perf_counter()
     from .mgrsCapture import MGRSCapture
-    return MGRSCapture(iface)
+    plugin = MGRSCapture(iface)
+    # Report the time the plugin adds to the QGIS startup
+    from qgis.core import Qgis, QgsMessageLog
+    QgsMessageLog.logMessage(
+        'Plugin loaded in {:.1f} ms'.format((time.perf_counter() - start) * 1000),
+        'MGRS', level=Qgis.Info, notifyUser=False)
+    return plugin
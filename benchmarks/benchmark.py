@@ -0,0 +1,184 @@
+"""
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+
+Benchmarks of the mgrs.py conversions. It runs without QGIS:
+
+    python benchmarks/benchmark.py --output results.json
+    python benchmarks/benchmark.py --compare results.json
+
+Scalar and batch encoding and decoding are timed on every available
+backend, in several regions (the UTM zones, the 31V/32V and Svalbard X zone
+exceptions and both UPS poles) and at precisions 0 to 5. The fastest of
+--repeat runs is kept. With --compare, the results are compared with those
+of an earlier run and the exit status is 1 if any case got slower than the
+--threshold.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import mgrs  # noqa: E402
+
+# Region name: latitude and longitude ranges of the random points
+REGIONS = {
+    'utm': ((-80.0, 84.0), (-180.0, 180.0)),
+    'norway-31V-32V': ((56.0, 64.0), (0.0, 12.0)),
+    'svalbard-X': ((72.0, 84.0), (0.0, 42.0)),
+    'ups-north': ((84.0, 90.0), (-180.0, 180.0)),
+    'ups-south': ((-90.0, -80.0), (-180.0, 180.0)),
+}
+
+PRECISIONS = range(0, 6)
+
+
+def randomPoints(region, count, seed):
+    (lat0, lat1), (lon0, lon1) = REGIONS[region]
+    rnd = random.Random('{}-{}'.format(seed, region))
+    lats = [rnd.uniform(lat0, lat1) for _ in range(count)]
+    lons = [rnd.uniform(lon0, lon1) for _ in range(count)]
+    return lats, lons
+
+
+def bestTime(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def runBackend(backend, args, report):
+    results = []
+    for region in REGIONS:
+        lats, lons = randomPoints(region, max(args.count, args.batch_count), args.seed)
+        slats, slons = lats[:args.count], lons[:args.count]
+        blats, blons = lats[:args.batch_count], lons[:args.batch_count]
+        for precision in PRECISIONS:
+            cases = []
+            strings = [mgrs.toMgrs(lat, lon, precision) for lat, lon in zip(slats, slons)]
+            cases.append(('encode', len(slats), lambda: [
+                mgrs.toMgrs(lat, lon, precision) for lat, lon in zip(slats, slons)]))
+            cases.append(('decode', len(strings), lambda: [mgrs.toWgs(s) for s in strings]))
+            if numpy is not None:
+                bstrings = mgrs.toMgrsBatch(blats, blons, precision)
+                cases.append(('encode-batch', len(blats), lambda: mgrs.toMgrsBatch(blats, blons, precision)))
+                cases.append(('decode-batch', len(bstrings), lambda: mgrs.toWgsBatch(bstrings)))
+            for operation, count, func in cases:
+                seconds = bestTime(func, args.repeat)
+                result = {
+                    'backend': backend,
+                    'region': region,
+                    'precision': precision,
+                    'operation': operation,
+                    'count': count,
+                    'seconds': seconds,
+                    'per_second': count / seconds if seconds > 0 else None}
+                results.append(result)
+                report(result)
+    return results
+
+
+def caseKey(result):
+    return (result['backend'], result['region'], result['precision'], result['operation'])
+
+
+def compare(results, baseline, threshold):
+    '''Return the cases whose time per coordinate grew by more than
+    threshold compared to baseline.'''
+    previous = {caseKey(r): r for r in baseline['results']}
+    slower = []
+    for result in results:
+        old = previous.get(caseKey(result))
+        if old is None or not old['seconds'] or not old['count']:
+            continue
+        ratio = (result['seconds'] / result['count']) / (old['seconds'] / old['count'])
+        if ratio > 1.0 + threshold:
+            slower.append((result, ratio))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the mgrs.py conversions.')
+    parser.add_argument('--backend', action='append', choices=mgrs.BACKENDS,
+                        help='backend to benchmark, may be repeated (default: all available)')
+    parser.add_argument('--count', type=int, default=1000,
+                        help='coordinates per scalar case (default: 1000)')
+    parser.add_argument('--batch-count', type=int, default=20000,
+                        help='coordinates per batch case (default: 20000)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per case, the fastest is kept (default: 3)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed of the coordinates')
+    parser.add_argument('--output', help='JSON file to write the results to')
+    parser.add_argument('--compare', help='JSON file of an earlier run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown reported as a regression (default: 0.2)')
+    args = parser.parse_args(argv)
+
+    def report(r):
+        print('{backend:7} {region:15} {precision} {operation:13} {count:7d} '
+              '{seconds:9.4f} s {per_second:12.0f}/s'.format(**r), file=sys.stderr)
+
+    results = []
+    backends = {}
+    for backend in args.backend or mgrs.BACKENDS:
+        try:
+            mgrs.init(backend)
+        except mgrs.MgrsException as e:
+            print('Skipping {}: {}'.format(backend, e), file=sys.stderr)
+            continue
+        backends[backend] = mgrs.INIT_TIME
+        results += runBackend(backend, args, report)
+
+    output = {
+        'meta': {
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': getattr(numpy, '__version__', None),
+            'backends': backends,
+            'import_time': mgrs.IMPORT_TIME,
+            'count': args.count,
+            'batch_count': args.batch_count,
+            'repeat': args.repeat,
+            'seed': args.seed},
+        'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=1)
+    elif not args.compare:
+        json.dump(output, sys.stdout, indent=1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        slower = compare(results, baseline, args.threshold)
+        for r, ratio in slower:
+            print('Slower by {:.0%}: {backend} {region} precision {precision} {operation}'.format(
+                ratio - 1.0, **r))
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
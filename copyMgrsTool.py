@@ -8,7 +8,9 @@
  *                                                                         *
  ***************************************************************************/
 """
-from qgis.PyQt.QtCore import Qt, pyqtSignal
+import time
+
+from qgis.PyQt.QtCore import Qt, QTimer, pyqtSignal
 from qgis.PyQt.QtGui import QColor
 from qgis.PyQt.QtWidgets import QApplication
 from qgis.core import Qgis, QgsCoordinateTransform, QgsPointXY, QgsProject, QgsSettings
@@ -24,19 +26,50 @@ class CopyMgrsTool(QgsMapToolEmitPoint):
     in the status bar.'''
     captureStopped = pyqtSignal()
 
+    # Mouse moves are handled at most once per display refresh
+    MOVE_INTERVAL = 16
+    # Status bar message timeout and the age at which an unchanged message
+    # is shown again so it does not disappear while the mouse moves
+    MESSAGE_TIMEOUT = 4000
+    MESSAGE_REFRESH = 3.0
+
     def __init__(self, iface):
         QgsMapToolEmitPoint.__init__(self, iface.mapCanvas())
         self.iface = iface
         self.canvas = iface.mapCanvas()
         self.marker = None
         self.vertex = None
+        self.transform = None
+        self.encoder = None
+        self.movePoint = None
+        self.lastPoint = None
+        self.lastMessage = None
+        self.lastMessageTime = 0
+        self.connected = False
+        self.moveTimer = QTimer(self)
+        self.moveTimer.setSingleShot(True)
+        self.moveTimer.setInterval(self.MOVE_INTERVAL)
+        self.moveTimer.timeout.connect(self.showMoveCoord)
 
     def activate(self):
         '''When activated set the cursor to a crosshair.'''
         self.canvas.setCursor(Qt.CrossCursor)
+        self.resetTransform()
+        if not self.connected:
+            self.canvas.destinationCrsChanged.connect(self.resetTransform)
+            QgsProject.instance().transformContextChanged.connect(self.resetTransform)
+            self.connected = True
         self.snapcolor = QgsSettings().value( "/qgis/digitizing/snap_color" , QColor( Qt.magenta ) )
 
     def deactivate(self):
+        if self.connected:
+            self.canvas.destinationCrsChanged.disconnect(self.resetTransform)
+            QgsProject.instance().transformContextChanged.disconnect(self.resetTransform)
+            self.connected = False
+        self.moveTimer.stop()
+        self.movePoint = None
+        self.lastPoint = None
+        self.lastMessage = None
         self.removeMarker()
         self.removeVertexMarker()
         self.captureStopped.emit()
@@ -45,14 +78,15 @@ class CopyMgrsTool(QgsMapToolEmitPoint):
         '''Format the coordinate string according to the settings from
         the settings dialog.'''
         # Make sure the coordinate is transformed to EPSG:4326
-        canvasCRS = self.canvas.mapSettings().destinationCrs()
-        if canvasCRS == epsg4326:
+        transform = self.canvasTransform()
+        if transform is None:
             pt4326 = pt
         else:
-            transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
             pt4326 = transform.transform(pt.x(), pt.y())
         try:
-            msg = mgrs.toMgrs(pt4326.y(), pt4326.x(), settings.mgrsPrecision)
+            if self.encoder is None or self.encoder.precision != settings.mgrsPrecision:
+                self.encoder = mgrs.MgrsEncoder(settings.mgrsPrecision)
+            msg = self.encoder.encode(pt4326.y(), pt4326.x())
             msg = formatMgrsString(msg, settings.addSpaces)
         except Exception:
             # traceback.print_exc()
@@ -61,18 +95,55 @@ class CopyMgrsTool(QgsMapToolEmitPoint):
         msg = '{}{}{}'.format(settings.mgrsPrefix, msg, settings.mgrsSuffix)
         return msg
 
+    def canvasTransform(self):
+        '''Return the canvas to EPSG:4326 transform, None if the canvas is
+        in EPSG:4326. It is built once and rebuilt after a change of the
+        canvas CRS.'''
+        if self.transform is None:
+            canvasCRS = self.canvas.mapSettings().destinationCrs()
+            if canvasCRS == epsg4326:
+                self.transform = False
+            else:
+                self.transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
+        return self.transform or None
+
+    def resetTransform(self):
+        self.transform = None
+        self.lastPoint = None
+
     def canvasMoveEvent(self, event):
         '''Capture the coordinate as the user moves the mouse over
-        the canvas. Show it in the status bar.'''
-        pt = self.snappoint(event.originalPixelPoint()) # input is QPoint
-        try:
-            msg = self.formatCoord(pt)
-            if msg is None:
-                self.iface.statusBarIface().showMessage("")
-            else:
-                self.iface.statusBarIface().showMessage("{}".format(msg), 4000)
-        except Exception:
+        the canvas. Show it in the status bar. Mouse moves are coalesced
+        so only the latest position is handled at each timer tick.'''
+        self.movePoint = event.originalPixelPoint()
+        if not self.moveTimer.isActive():
+            self.moveTimer.start()
+
+    def showMoveCoord(self):
+        if self.movePoint is None:
+            return
+        pt = self.snappoint(self.movePoint) # input is QPoint
+        self.movePoint = None
+        if pt == self.lastPoint:
+            # The cursor is still on the same map point
+            msg = self.lastMessage
+        else:
+            self.lastPoint = pt
+            try:
+                msg = self.formatCoord(pt)
+            except Exception:
+                msg = None
+        # Only update the status bar when the cursor moved to another MGRS
+        # cell, or to keep the message from timing out
+        now = time.monotonic()
+        if msg == self.lastMessage and now - self.lastMessageTime < self.MESSAGE_REFRESH:
+            return
+        self.lastMessage = msg
+        self.lastMessageTime = now
+        if msg is None:
             self.iface.statusBarIface().showMessage("")
+        else:
+            self.iface.statusBarIface().showMessage("{}".format(msg), self.MESSAGE_TIMEOUT)
 
     def snappoint(self, qpoint):
         match = self.canvas.snappingUtils().snapToMap(qpoint)
@@ -30,36 +30,50 @@ import os
 import sys
 import re
 import math
+import functools
 import itertools
 import logging
-
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from types import SimpleNamespace
+
+_IMPORT_START = time.perf_counter()
+
+# NumPy is only imported once an array conversion needs it
+np = None
+_NUMPY_OPS = None
+
+# The coordinate transformation backend is selected on the first conversion,
+# or explicitly with init(). It is one of BACKENDS: GDAL OSR, pyproj or the
+# built-in transverse mercator and polar stereographic engines.
+BACKENDS = ('osr', 'pyproj', 'native')
+BACKEND = None
 HAVE_OSR = False
-# Force using proj for transformations by setting MGRSPY_USE_PROJ env var
-if os.environ.get('MGRSPY_USE_PROJ', None) is None:
-    try:
-        from osgeo import osr
-        HAVE_OSR = True
-    except ImportError:
-        pass
-
 PYPROJ_VER = 0
-if not HAVE_OSR:
-    try:
-        from pyproj import Transformer, CRS, __version__ as pyproj_ver
-        PYPROJ_VER = 2
-        if float(pyproj_ver[:3]) < 2.2:
-            raise Exception('Unsupported pyproj version (need >= 2.2)')
-    except ImportError:
-        from pyproj import Proj, transform, __version__ as pyproj_ver
-        if float(pyproj_ver[:3]) < 1.9 or int(pyproj_ver[4]) < 5:
-            raise Exception('Unsupported pyproj version (need >= 1.9.5)')
-        PYPROJ_VER = 1
+NATIVE = False
+# Force using proj for transformations by setting MGRSPY_USE_PROJ env var,
+# or the built-in transverse mercator engine by setting it to 'native'
+USE_PROJ = os.environ.get('MGRSPY_USE_PROJ', None)
+
+# Seconds taken to import this module and to initialize the backend
+IMPORT_TIME = None
+INIT_TIME = None
+
+_initLock = threading.Lock()
+# Backend modules, imported by init()
+osr = Transformer = CRS = Proj = transform = None
 
 LOG_LEVEL = os.environ.get('PYTHON_LOG_LEVEL', 'WARNING').upper()
 FORMAT = "%(levelname)s [%(name)s:%(lineno)s  %(funcName)s()] %(message)s"
-logging.basicConfig(level=LOG_LEVEL, format=FORMAT)
 log = logging.getLogger(__name__)
 
+# Instrumentation, see enable_stats(): stage name -> [calls, seconds]
+STATS_ENABLED = False
+_stats = {}
+_statsLock = threading.Lock()
+_stageFunctions = []
+
 BADLY_FORMED = \
     'An MGRS string error: string too long, too short, or badly formed'
 
@@ -67,11 +81,20 @@ BADLY_FORMED = \
 # added in geotrans3.8
 GEOTRANS_HALFMULTI = False
 
-ALPHABET = {l: c for c, l in enumerate('ABCDEFGHIJKLMNOPQRSTUVWXYZ')}
+_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+ALPHABET = {l: c for c, l in enumerate(_LETTERS)}
+_LETTER_OF = {c: l for l, c in ALPHABET.items()}
 
 ONEHT = 100000.0
 TWOMIL = 2000000.0
 
+# Maximum number of coordinate transformers cached per thread; a transformer
+# exists per (source EPSG, destination EPSG, polar) combination
+TRANSFORMER_CACHE_SIZE = 64
+
+_transformerLocal = threading.local()
+_transformerGeneration = 0
+
 MAX_PRECISION = 5         # Maximum precision of easting & northing
 MIN_EAST_NORTH = 0
 MAX_EAST_NORTH = 4000000
@@ -116,11 +139,218 @@ LATITUDE_BANDS = [(ALPHABET['C'], 1100000.0, -72.0, -80.5, 0.0),
                   (ALPHABET['X'], 7900000.0, 84.5, 72.0, 6000000.0)]
 
 
+# WGS84 ellipsoid, UTM and UPS projection parameters of the native engines
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+WGS84_E = math.sqrt(WGS84_E2)
+UTM_SCALE_FACTOR = 0.9996
+UTM_FALSE_EASTING = 500000.0
+UPS_SCALE_FACTOR = 0.994
+UPS_FALSE_EASTING = 2000000.0
+UPS_FALSE_NORTHING = 2000000.0
+_TAUF_LARGE = math.exp(WGS84_E * math.atanh(WGS84_E))
+_TAUF_MAX = 2 / math.sqrt(sys.float_info.epsilon)
+_UPS_C = math.sqrt(1 - WGS84_E2) * _TAUF_LARGE
+
+# Krueger series coefficients to 6th order in the third flattening
+_n = WGS84_F / (2 - WGS84_F)
+_TM_A = WGS84_A / (1 + _n) * (
+    1 + _n ** 2 / 4 + _n ** 4 / 64 + _n ** 6 / 256)
+_TM_ALPHA = (
+    _n / 2 - 2 * _n ** 2 / 3 + 5 * _n ** 3 / 16 + 41 * _n ** 4 / 180
+    - 127 * _n ** 5 / 288 + 7891 * _n ** 6 / 37800,
+    13 * _n ** 2 / 48 - 3 * _n ** 3 / 5 + 557 * _n ** 4 / 1440
+    + 281 * _n ** 5 / 630 - 1983433 * _n ** 6 / 1935360,
+    61 * _n ** 3 / 240 - 103 * _n ** 4 / 140 + 15061 * _n ** 5 / 26880
+    + 167603 * _n ** 6 / 181440,
+    49561 * _n ** 4 / 161280 - 179 * _n ** 5 / 168
+    + 6601661 * _n ** 6 / 7257600,
+    34729 * _n ** 5 / 80640 - 3418889 * _n ** 6 / 1995840,
+    212378941 * _n ** 6 / 319334400)
+_TM_BETA = (
+    _n / 2 - 2 * _n ** 2 / 3 + 37 * _n ** 3 / 96 - _n ** 4 / 360
+    - 81 * _n ** 5 / 512 + 96199 * _n ** 6 / 604800,
+    _n ** 2 / 48 + _n ** 3 / 15 - 437 * _n ** 4 / 1440
+    + 46 * _n ** 5 / 105 - 1118711 * _n ** 6 / 3870720,
+    17 * _n ** 3 / 480 - 37 * _n ** 4 / 840 - 209 * _n ** 5 / 4480
+    + 5569 * _n ** 6 / 90720,
+    4397 * _n ** 4 / 161280 - 11 * _n ** 5 / 504
+    - 830251 * _n ** 6 / 7257600,
+    4583 * _n ** 5 / 161280 - 108847 * _n ** 6 / 3991680,
+    20648693 * _n ** 6 / 638668800)
+del _n
+
+_MATH_OPS = SimpleNamespace(
+    sin=math.sin, cos=math.cos, tan=math.tan, sinh=math.sinh,
+    cosh=math.cosh, asinh=math.asinh, atanh=math.atanh, atan=math.atan,
+    atan2=math.atan2, hypot=math.hypot, radians=math.radians,
+    degrees=math.degrees, maximum=max, all=bool,
+    where=lambda condition, x, y: x if condition else y)
+
+# Zone digits, MGRS letters and easting & northing digits of a whitespace
+# stripped MGRS string
+_MGRS_RE = re.compile(r'([0-9]{0,2})([A-Za-z]{3})([0-9]{0,10})$')
+
+# Meters per unit of the easting & northing digits, per precision
+_SCALES = (1.0e5, 1.0e4, 1.0e3, 1.0e2, 1.0e1, 1.0e0)
+
+# Parsed MGRS coordinate: UTM zone (0 for UPS), latitude band letter (the
+# polar zone letter A, B, Y or Z for UPS), 100 km square column and row
+# letters, easting and northing within the square in meters and precision
+MgrsCoordinate = namedtuple(
+    'MgrsCoordinate',
+    ['zone', 'band', 'column', 'row', 'easting', 'northing', 'precision'])
+
+
 class MgrsException(Exception):
     pass
 
 
+def _stage(name):
+    """ Decorator registering a function as an instrumented stage. Functions
+    are only wrapped while statistics are enabled, so they cost nothing
+    otherwise. """
+    def register(func):
+        _stageFunctions.append((name, func))
+        return func
+    return register
+
+
+def _timed(name, func):
+    perf_counter = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            with _statsLock:
+                entry = _stats.get(name)
+                if entry is None:
+                    _stats[name] = [1, elapsed]
+                else:
+                    entry[0] += 1
+                    entry[1] += elapsed
+    return wrapper
+
+
+def enable_stats(enabled=True):
+    """ Enables or disables the collection of call counts and times, also
+    enabled by setting the MGRSPY_STATS env var. While disabled the
+    conversions run without any instrumentation overhead.
+
+    @param enabled - whether statistics are collected
+    """
+    global STATS_ENABLED
+    module = globals()
+    for name, func in _stageFunctions:
+        module[func.__name__] = _timed(name, func) if enabled else func
+    STATS_ENABLED = bool(enabled)
+
+
+def stats():
+    """ Returns the statistics collected since the last reset_stats() as a
+    dict of stage name to a dict with the number of 'calls' and the
+    cumulative 'seconds'. The stages are 'parse' (string cleaning and
+    parsing), 'zone' (zone and EPSG lookup), 'transform' (coordinate
+    transformation), 'grid' (100 km square letters to UTM/UPS), 'format'
+    (UTM/UPS to MGRS string) and the public toMgrs, toWgs, toMgrsBatch and
+    toWgsBatch functions as a whole. Batch functions count one call per
+    zone for the transform stage.
+    """
+    with _statsLock:
+        return {name: {'calls': calls, 'seconds': seconds}
+                for name, (calls, seconds) in _stats.items()}
+
+
+def reset_stats():
+    """ Clears the collected statistics """
+    with _statsLock:
+        _stats.clear()
+
+
+def init(backend=None):
+    """ Selects and loads the coordinate transformation backend. Calling it
+    is optional, the backend is otherwise loaded on the first conversion so
+    importing this module stays cheap.
+
+    @param backend - 'osr', 'pyproj' or 'native'. If None, the backend is
+        chosen from the MGRSPY_USE_PROJ env var as at import time in
+        earlier versions: GDAL OSR unless the variable is set, pyproj if
+        set and the native engine if set to 'native', falling back to the
+        native engine if neither GDAL OSR nor pyproj can be imported.
+    @returns - name of the selected backend
+    """
+    global BACKEND, HAVE_OSR, PYPROJ_VER, NATIVE, INIT_TIME
+    if backend is not None and backend not in BACKENDS:
+        raise MgrsException('Unknown backend {0} (expected one of {1})'
+                            .format(backend, ', '.join(BACKENDS)))
+    with _initLock:
+        start = time.perf_counter()
+        if backend is None:
+            if USE_PROJ is not None and USE_PROJ.strip().lower() == 'native':
+                selected = 'native'
+            elif USE_PROJ is None and _loadOsr():
+                selected = 'osr'
+            elif _loadPyproj():
+                selected = 'pyproj'
+            else:
+                # Neither GDAL OSR nor pyproj, fall back to the built-in engine
+                selected = 'native'
+        elif backend == 'osr' and not _loadOsr():
+            raise MgrsException('GDAL OSR backend is not available')
+        elif backend == 'pyproj' and not _loadPyproj():
+            raise MgrsException('pyproj backend is not available')
+        else:
+            selected = backend
+
+        HAVE_OSR = selected == 'osr'
+        NATIVE = selected == 'native'
+        if selected != 'pyproj':
+            PYPROJ_VER = 0
+        BACKEND = selected
+        INIT_TIME = time.perf_counter() - start
+        clearTransformerCache()
+    if 'PYTHON_LOG_LEVEL' in os.environ:
+        logging.basicConfig(level=LOG_LEVEL, format=FORMAT)
+    log.debug('backend: %s (%.1f ms)', BACKEND, INIT_TIME * 1000)
+    return BACKEND
+
+
+def _loadOsr():
+    global osr
+    try:
+        from osgeo import osr
+    except ImportError:
+        return False
+    return True
+
+
+def _loadPyproj():
+    global PYPROJ_VER, Transformer, CRS, Proj, transform
+    try:
+        try:
+            from pyproj import Transformer, CRS, __version__ as pyproj_ver
+            PYPROJ_VER = 2
+            if float(pyproj_ver[:3]) < 2.2:
+                raise Exception('Unsupported pyproj version (need >= 2.2)')
+        except ImportError:
+            from pyproj import Proj, transform, __version__ as pyproj_ver
+            if float(pyproj_ver[:3]) < 1.9 or int(pyproj_ver[4]) < 5:
+                raise Exception('Unsupported pyproj version (need >= 1.9.5)')
+            PYPROJ_VER = 1
+    except ImportError:
+        return False
+    return True
+
+
 def _log_proj_crs(proj_crs, proj_desc='', espg=''):
+    # Exporting the WKT is expensive, only do it when it gets logged
+    if not log.isEnabledFor(logging.DEBUG):
+        return
     if proj_desc:
         proj_desc = '{0} '.format(str(proj_desc))
     if espg:
@@ -136,13 +366,17 @@ def _log_proj_crs(proj_crs, proj_desc='', espg=''):
         proj_desc, espg, os.linesep, definition))
 
 
-def _transform_proj(x1, y1, epsg_src, epsg_dst, polar=False):
+def _proj_transformer(epsg_src, epsg_dst, polar=False):
     if PYPROJ_VER == 1:
         proj_src = Proj(init='epsg:{0}'.format(epsg_src))
         _log_proj_crs(proj_src, proj_desc='src', espg=epsg_src)
         proj_dst = Proj(init='epsg:{0}'.format(epsg_dst))
         _log_proj_crs(proj_dst, proj_desc='dst', espg=epsg_dst)
-        x2, y2 = transform(proj_src, proj_dst, x1, y1)
+
+        def _proj1(x1, y1):
+            return transform(proj_src, proj_dst, x1, y1)
+
+        return _proj1
     elif PYPROJ_VER == 2:
         # With PROJ 6+ input axis ordering needs honored per projection, even
         #   though always_xy should fix it (doesn't seem to work for UPS)
@@ -151,17 +385,20 @@ def _transform_proj(x1, y1, epsg_src, epsg_dst, polar=False):
         crs_dst = CRS.from_epsg(epsg_dst)
         _log_proj_crs(crs_dst, proj_desc='dst', espg=epsg_dst)
         ct = Transformer.from_crs(crs_src, crs_dst, always_xy=(not polar))
-        if polar:
-            y2, x2 = ct.transform(y1, x1)
-        else:
-            x2, y2 = ct.transform(x1, y1)
+
+        def _proj2(x1, y1):
+            if polar:
+                y2, x2 = ct.transform(y1, x1)
+            else:
+                x2, y2 = ct.transform(x1, y1)
+            return x2, y2
+
+        return _proj2
     else:
         raise MgrsException('pyproj version unsupported')
 
-    return x2, y2
-
 
-def _transform_osr(x1, y1, epsg_src, epsg_dst, polar=False):
+def _osr_transformer(epsg_src, epsg_dst, polar=False):
     src = osr.SpatialReference()
     # Check if we are using osgeo.osr linked against PROJ 6+
     # If so, input axis ordering needs honored per projection, even though
@@ -180,22 +417,402 @@ def _transform_osr(x1, y1, epsg_src, epsg_dst, polar=False):
     dst.ImportFromEPSG(epsg_dst)
     _log_proj_crs(dst, proj_desc='dst', espg=epsg_dst)
     ct = osr.CoordinateTransformation(src, dst)
-    if polar and osr_proj6:
-        # only supported with osgeo.osr v3.0.0+
-        y2, x2, _ = ct.TransformPoint(y1, x1)
+
+    def _osr(x1, y1):
+        if polar and osr_proj6:
+            # only supported with osgeo.osr v3.0.0+
+            x1, y1 = y1, x1
+        if _isArray(x1):
+            xy = ct.TransformPoints(list(zip(x1.tolist(), y1.tolist())))
+            xy = np.array(xy, dtype=np.float64).reshape(-1, 3)
+            x2, y2 = xy[:, 0], xy[:, 1]
+        else:
+            x2, y2, _ = ct.TransformPoint(x1, y1)
+        if polar and osr_proj6:
+            x2, y2 = y2, x2
+        return x2, y2
+
+    # The transformation must not outlive its spatial references
+    _osr.srs = (src, dst)
+    return _osr
+
+
+def _native_transformer(epsg_src, epsg_dst):
+    """ Returns a function transforming between WGS84 (EPSG:4326) and a
+    WGS84 UTM zone (EPSG:326xx / 327xx) or UPS (EPSG:32661 / 32761) with
+    the built-in transverse mercator and polar stereographic engines. Both
+    work in easting, northing axis order, UPS included.
+    """
+    if epsg_src == 4326:
+        zone, north = _utmZoneForEpsg(epsg_dst)
+        forward = True
+    elif epsg_dst == 4326:
+        zone, north = _utmZoneForEpsg(epsg_src)
+        forward = False
     else:
-        x2, y2, _ = ct.TransformPoint(x1, y1)
+        zone = None
+    if zone is None:
+        raise MgrsException(
+            'Unsupported transformation: EPSG:{0} to EPSG:{1}'.format(
+                epsg_src, epsg_dst))
 
-    return x2, y2
+    if zone == 61:
+        def _native_ups(x1, y1):
+            if forward:
+                return _upsForward(x1, y1, north)
+            return _upsInverse(x1, y1, north)
 
+        return _native_ups
 
-def _transform(x1, y1, epsg_src, epsg_dst, polar=False):
-    if HAVE_OSR:
-        return _transform_osr(x1, y1, epsg_src, epsg_dst, polar=polar)
+    centralMeridian = zone * 6.0 - 183.0
+    falseNorthing = 0.0 if north else 10000000.0
+
+    def _native(x1, y1):
+        if forward:
+            return _tmForward(x1, y1, centralMeridian, falseNorthing)
+        return _tmInverse(x1, y1, centralMeridian, falseNorthing)
+
+    return _native
+
+
+def _utmZoneForEpsg(epsg):
+    """ Returns the UTM zone (61 for UPS) and whether it is north for a
+    WGS84 UTM / UPS EPSG code, or (None, None) for any other code.
+    """
+    if 32601 <= epsg <= 32661:
+        return epsg - 32600, True
+    if 32701 <= epsg <= 32761:
+        return epsg - 32700, False
+    return None, None
+
+
+def _ops(x):
+    """ Returns the math functions to use for x, a scalar or NumPy array """
+    if _isArray(x):
+        return _NUMPY_OPS
+    return _MATH_OPS
+
+
+def _taupf(tau, ops):
+    """ Returns tan of the conformal latitude for tau, tan of the geodetic
+    latitude (Karney, 2011, eq. 7-9).
+    """
+    tau1 = ops.hypot(1.0, tau)
+    sig = ops.sinh(WGS84_E * ops.atanh(WGS84_E * tau / tau1))
+    return ops.hypot(1.0, sig) * tau - sig * tau1
+
+
+def _tauf(taup, ops):
+    """ Inverse of _taupf, solved with Newton's method (Karney, 2011,
+    eq. 19-21).
+    """
+    e2m = 1.0 - WGS84_E2
+    tau0 = ops.where(abs(taup) > 70, taup * _TAUF_LARGE, taup / e2m)
+    # Beyond _TAUF_MAX the initial guess is exact to double precision, only
+    # iterate on the other values to avoid overflows
+    large = abs(tau0) >= _TAUF_MAX
+    tau = ops.where(large, 0.0, tau0)
+    taup = ops.where(large, 0.0, taup)
+    tol = 1.0e-13 * ops.maximum(1.0, abs(taup))
+    for _ in range(5):
+        taupa = _taupf(tau, ops)
+        dtau = (taup - taupa) * (1.0 + e2m * tau * tau) / \
+            (e2m * ops.hypot(1.0, tau) * ops.hypot(1.0, taupa))
+        tau = tau + dtau
+        if ops.all(abs(dtau) < tol):
+            break
+    return ops.where(large, tau0, tau)
+
+
+def _tmForward(longitude, latitude, centralMeridian, falseNorthing):
+    """ Projects geodetic coordinates to UTM with the 6th order Krueger
+    series (Karney, 2011, Transverse Mercator with an accuracy of a few
+    nanometers).
+
+    @param longitude - longitude value(s)
+    @param latitude - latitude value(s)
+    @param centralMeridian - central meridian of the zone in degrees
+    @param falseNorthing - false northing in meters
+    @returns - tuple containing easting(s) and northing(s)
+    """
+    ops = _ops(latitude)
+    lam = ops.radians(longitude - centralMeridian)
+    taup = _taupf(ops.tan(ops.radians(latitude)), ops)
+    coslam = ops.cos(lam)
+    xip = ops.atan2(taup, coslam)
+    etap = ops.asinh(ops.sin(lam) / ops.hypot(taup, coslam))
+
+    xi = xip
+    eta = etap
+    for j, alpha in enumerate(_TM_ALPHA, 1):
+        xi = xi + alpha * ops.sin(2 * j * xip) * ops.cosh(2 * j * etap)
+        eta = eta + alpha * ops.cos(2 * j * xip) * ops.sinh(2 * j * etap)
+
+    easting = UTM_FALSE_EASTING + UTM_SCALE_FACTOR * _TM_A * eta
+    northing = falseNorthing + UTM_SCALE_FACTOR * _TM_A * xi
+    return easting, northing
+
+
+def _tmInverse(easting, northing, centralMeridian, falseNorthing):
+    """ Inverse of _tmForward
+
+    @param easting - easting value(s) in meters
+    @param northing - northing value(s) in meters
+    @param centralMeridian - central meridian of the zone in degrees
+    @param falseNorthing - false northing in meters
+    @returns - tuple containing longitude(s) and latitude(s)
+    """
+    ops = _ops(easting)
+    xi = (northing - falseNorthing) / (UTM_SCALE_FACTOR * _TM_A)
+    eta = (easting - UTM_FALSE_EASTING) / (UTM_SCALE_FACTOR * _TM_A)
+
+    xip = xi
+    etap = eta
+    for j, beta in enumerate(_TM_BETA, 1):
+        xip = xip - beta * ops.sin(2 * j * xi) * ops.cosh(2 * j * eta)
+        etap = etap - beta * ops.cos(2 * j * xi) * ops.sinh(2 * j * eta)
+
+    sinhetap = ops.sinh(etap)
+    cosxip = ops.cos(xip)
+    taup = ops.sin(xip) / ops.hypot(sinhetap, cosxip)
+    latitude = ops.degrees(ops.atan(_tauf(taup, ops)))
+    longitude = centralMeridian + ops.degrees(ops.atan2(sinhetap, cosxip))
+    # normalize to [-180, 180)
+    longitude = (longitude + 180.0) % 360.0 - 180.0
+    return longitude, latitude
+
+
+def _upsForward(longitude, latitude, north):
+    """ Projects geodetic coordinates to UPS with the ellipsoidal polar
+    stereographic projection (Karney, 2011).
+
+    @param longitude - longitude value(s)
+    @param latitude - latitude value(s)
+    @param north - True for the north pole (EPSG:32661), False for the
+    south pole (EPSG:32761)
+    @returns - tuple containing easting(s) and northing(s)
+    """
+    ops = _ops(latitude)
+    if not north:
+        latitude = -latitude
+    taup = _taupf(ops.tan(ops.radians(latitude)), ops)
+    # 1 / (sec + tan) is (sec - tan) without the cancellation near the pole
+    rho = 1.0 / (ops.hypot(1.0, taup) + taup)
+    rho = rho * (2 * UPS_SCALE_FACTOR * WGS84_A / _UPS_C)
+    lam = ops.radians(longitude)
+    easting = UPS_FALSE_EASTING + rho * ops.sin(lam)
+    if north:
+        northing = UPS_FALSE_NORTHING - rho * ops.cos(lam)
+    else:
+        northing = UPS_FALSE_NORTHING + rho * ops.cos(lam)
+    return easting, northing
+
+
+def _upsInverse(easting, northing, north):
+    """ Inverse of _upsForward
+
+    @param easting - easting value(s) in meters
+    @param northing - northing value(s) in meters
+    @param north - True for the north pole, False for the south pole
+    @returns - tuple containing longitude(s) and latitude(s)
+    """
+    ops = _ops(easting)
+    x = easting - UPS_FALSE_EASTING
+    y = northing - UPS_FALSE_NORTHING
+    if north:
+        y = -y
+    t = ops.hypot(x, y) / (2 * UPS_SCALE_FACTOR * WGS84_A / _UPS_C)
+    t = ops.maximum(t, 1.0e-300)
+    taup = (1.0 / t - t) / 2.0
+    latitude = ops.degrees(ops.atan(_tauf(taup, ops)))
+    longitude = ops.degrees(ops.atan2(x, y))
+    if not north:
+        latitude = -latitude
+    return longitude, latitude
+
+
+def _transformerCache():
+    """ Returns the transformer cache of the calling thread. Transformer
+    objects of OSR and pyproj must not be shared between threads, so every
+    thread (e.g. each QGIS processing task) gets its own cache.
+    """
+    cache = getattr(_transformerLocal, 'cache', None)
+    if cache is None or \
+            _transformerLocal.generation != _transformerGeneration:
+        cache = OrderedDict()
+        _transformerLocal.cache = cache
+        _transformerLocal.generation = _transformerGeneration
+    return cache
+
+
+def clearTransformerCache():
+    """ Discards all cached coordinate transformers, in every thread.
+    Threads rebuild their transformers on their next conversion.
+    """
+    global _transformerGeneration
+    _transformerGeneration += 1
+
+
+class _ConversionCache():
+    """ Thread safe least recently used cache of conversion results, with
+    hit and miss counters. Disabled while maxsize is 0. """
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.items.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def resize(self, maxsize):
+        with self.lock:
+            self.maxsize = max(int(maxsize), 0)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self.items), 'maxsize': self.maxsize}
+
+
+_wgsCache = _ConversionCache()
+_mgrsCache = _ConversionCache()
+
+
+def setConversionCacheSize(size):
+    """ Sets the number of results kept by the toWgs and toMgrs caches,
+    also set by the MGRSPY_CACHE_SIZE env var. The caches are disabled with
+    a size of 0, the default. toWgs results are cached per parsed MGRS
+    coordinate, so differently spaced or cased strings share an entry.
+    toMgrs results are cached per latitude and longitude rounded to 9
+    decimal places (about 0.1 mm) and precision; while the cache is enabled
+    toMgrs converts the rounded coordinates, so a result never depends on
+    which coordinate filled the entry.
+
+    @param size - maximum number of results kept per cache
+    """
+    _wgsCache.resize(size)
+    _mgrsCache.resize(size)
+
+
+def clearConversionCache():
+    """ Empties the toWgs and toMgrs caches and resets their counters """
+    _wgsCache.clear()
+    _mgrsCache.clear()
+
+
+def conversionCacheStats():
+    """ Returns the 'hits', 'misses', current 'size' and 'maxsize' of the
+    'toWgs' and 'toMgrs' caches """
+    return {'toWgs': _wgsCache.stats(), 'toMgrs': _mgrsCache.stats()}
+
+
+def _getTransformer(epsg_src, epsg_dst, polar=False):
+    """ Returns a function transforming x, y coordinates from epsg_src to
+    epsg_dst. Transformers are cached per (epsg_src, epsg_dst, polar), the
+    least recently used one is evicted once more than
+    TRANSFORMER_CACHE_SIZE are held.
+
+    @param epsg_src - source EPSG code
+    @param epsg_dst - destination EPSG code
+    @param polar - whether one of the projections is UPS
+    @returns - function taking x, y and returning the transformed x, y
+    """
+    key = (epsg_src, epsg_dst, polar)
+    cache = _transformerCache()
+    ct = cache.get(key)
+    if ct is not None:
+        cache.move_to_end(key)
+        return ct
+
+    if BACKEND is None:
+        init()
+    if NATIVE:
+        ct = _native_transformer(epsg_src, epsg_dst)
+    elif HAVE_OSR:
+        ct = _osr_transformer(epsg_src, epsg_dst, polar=polar)
     else:
-        return _transform_proj(x1, y1, epsg_src, epsg_dst, polar=polar)
+        ct = _proj_transformer(epsg_src, epsg_dst, polar=polar)
+
+    cache[key] = ct
+    while len(cache) > max(TRANSFORMER_CACHE_SIZE, 1):
+        cache.popitem(last=False)
+    return ct
+
+
+@_stage('transform')
+def _transform(x1, y1, epsg_src, epsg_dst, polar=False):
+    return _getTransformer(epsg_src, epsg_dst, polar=polar)(x1, y1)
+
+
+def _loadNumpy():
+    global np, _NUMPY_OPS
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return False
+        _NUMPY_OPS = SimpleNamespace(
+            sin=numpy.sin, cos=numpy.cos, tan=numpy.tan, sinh=numpy.sinh,
+            cosh=numpy.cosh, asinh=numpy.arcsinh, atanh=numpy.arctanh,
+            atan=numpy.arctan, atan2=numpy.arctan2, hypot=numpy.hypot,
+            radians=numpy.radians, degrees=numpy.degrees,
+            maximum=numpy.maximum, all=numpy.all, where=numpy.where)
+        np = numpy
+    return True
+
+
+def _isArray(x):
+    """ Whether x is a NumPy array, without importing NumPy for scalars """
+    if np is None and 'numpy' not in sys.modules:
+        return False
+    return _loadNumpy() and isinstance(x, np.ndarray)
+
 
+def _requireNumpy():
+    if not _loadNumpy():
+        raise MgrsException('NumPy is required for batch conversions.')
 
+
+def _isBatch(x):
+    """ Whether x is a sequence or an array of coordinates """
+    return isinstance(x, (list, tuple)) or _isArray(x)
+
+
+def _checkRange(latitude, longitude):
+    """ Range check of latitude and longitude arrays """
+    if not np.all(np.fabs(latitude) <= 90):
+        raise MgrsException(
+            'Latitude outside of valid range (-90 to 90 degrees).')
+
+    if not np.all((longitude >= -180) & (longitude <= 360)):
+        raise MgrsException(
+            'Longitude outside of valid range (-180 to 360 degrees).')
+
+
+@_stage('toMgrs')
 def toMgrs(latitude, longitude, precision=5):
     """ Converts geodetic (latitude and longitude) coordinates to an MGRS
     coordinate string, according to the current ellipsoid parameters.
@@ -213,6 +830,15 @@ def toMgrs(latitude, longitude, precision=5):
         latitude = round(latitude, 9)
         longitude = round(longitude, 9)
 
+    key = None
+    if _mgrsCache.maxsize:
+        latitude = round(latitude, 9)
+        longitude = round(longitude, 9)
+        key = (latitude, longitude, precision)
+        mgrs = _mgrsCache.get(key)
+        if mgrs is not None:
+            return mgrs
+
     if math.fabs(latitude) > 90:
         raise MgrsException(
             'Latitude outside of valid range (-90 to 90 degrees).')
@@ -236,26 +862,317 @@ def toMgrs(latitude, longitude, precision=5):
         mgrs = _utmToMgrs(
             zone, hemisphere, latitude, longitude, x, y, precision)
 
+    if key is not None:
+        _mgrsCache.put(key, mgrs)
     return mgrs
 
 
+# Longitude ranges of the UTM zones of the V and X latitude bands that are
+# not regular 6 degree zones
+_SPECIAL_ZONES = {
+    ('V', 31): (0.0, 3.0), ('V', 32): (3.0, 12.0),
+    ('X', 31): (0.0, 9.0), ('X', 33): (9.0, 21.0),
+    ('X', 35): (21.0, 33.0), ('X', 37): (33.0, 42.0)}
+
+# Degrees by which a zone and band rectangle is shrunk, so points on or
+# next to its edges always take the toMgrs path
+_REGION_MARGIN = 1e-9
+
+
+class MgrsEncoder():
+    """ Converts sequences of geodetic coordinates, such as GPS tracks or
+    mouse positions, to MGRS coordinate strings. The encoder remembers the
+    UTM zone, latitude band, grid values and transformer of the last point;
+    while the following points stay inside that zone and band only the
+    projection and the grid letters are computed. Points elsewhere, on
+    zone or band edges and in the UPS regions are converted with toMgrs.
+    The result is always identical to toMgrs.
+
+    An encoder holds a transformer of the thread that created it and must
+    not be shared between threads.
+    """
+    def __init__(self, precision=5):
+        if (precision < 0) or (precision > MAX_PRECISION):
+            raise MgrsException(
+                'The precision must be between 0 and 5 inclusive.')
+        self.precision = precision
+        self._region = None
+
+    def encode(self, latitude, longitude):
+        """ Converts a latitude and longitude to an MGRS coordinate string
+
+        @param latitude - latitude value
+        @param longitude - longitude value
+        @returns - MGRS coordinate string
+        """
+        if _mgrsCache.maxsize:
+            # toMgrs converts the rounded coordinates while cached
+            latitude = round(latitude, 9)
+            longitude = round(longitude, 9)
+        region = self._region
+        if region is not None \
+                and region[0] < latitude < region[1] \
+                and region[2] < longitude < region[3] \
+                and self._generation == _transformerGeneration:
+            easting, northing = self._transformer(longitude, latitude)
+            if not (latitude <= 0.0 and northing == 1.0e7):
+                return _utmGridToMgrs(
+                    self._zone, self._letter, self._ltr2LowValue,
+                    self._patternOffset, easting, northing, self.precision)
+
+        mgrs = toMgrs(latitude, longitude, self.precision)
+        self._setRegion(latitude, longitude)
+        return mgrs
+
+    def reset(self):
+        """ Forgets the zone and band of the last point """
+        self._region = None
+
+    def _setRegion(self, latitude, longitude):
+        self._region = None
+        if not (-80 < latitude < 84 and -180 <= longitude < 180):
+            return
+        hemisphere, zone, epsg = _epsgForWgs(latitude, longitude)
+        letter = _latitudeLetter(latitude)
+        band = LATITUDE_BANDS[[b[0] for b in LATITUDE_BANDS].index(letter)]
+        latMin = max(band[3], -80.0)
+        latMax = min(band[2], 84.0)
+        lonMin, lonMax = _SPECIAL_ZONES.get(
+            (_LETTERS[letter], zone), (zone * 6.0 - 186.0, zone * 6.0 - 180.0))
+        self._zone = zone
+        self._letter = letter
+        self._ltr2LowValue, _, self._patternOffset = _gridValues(zone)
+        self._transformer = _getTransformer(4326, epsg, polar=False)
+        self._generation = _transformerGeneration
+        self._region = (latMin + _REGION_MARGIN, latMax - _REGION_MARGIN,
+                        lonMin + _REGION_MARGIN, lonMax - _REGION_MARGIN)
+
+
+@_stage('toMgrsBatch')
+def toMgrsBatch(latitudes, longitudes, precision=5):
+    """ Converts arrays of geodetic (latitude and longitude) coordinates to
+    MGRS coordinate strings. The result is identical to calling toMgrs for
+    every point, but points are grouped per UTM/UPS zone and every group is
+    transformed with a single call.
+
+    @param latitudes - sequence or NumPy array of latitude values
+    @param longitudes - sequence or NumPy array of longitude values
+    @param precision - precision level of MGRS strings
+    @returns - list of MGRS coordinate strings
+    """
+    _requireNumpy()
+    latitude = np.asarray(latitudes, dtype=np.float64).ravel()
+    longitude = np.asarray(longitudes, dtype=np.float64).ravel()
+    if latitude.shape != longitude.shape:
+        raise MgrsException(
+            'Latitude and longitude arrays must have the same length.')
+
+    if sys.version_info.major < 3:
+        latitude = np.round(latitude, 9)
+        longitude = np.round(longitude, 9)
+
+    _checkRange(latitude, longitude)
+
+    if (precision < 0) or (precision > MAX_PRECISION):
+        raise MgrsException('The precision must be between 0 and 5 inclusive.')
+
+    north, zone, epsg = _epsgForWgsArray(latitude, longitude)
+
+    x = np.empty_like(latitude)
+    y = np.empty_like(latitude)
+    order = np.argsort(epsg, kind='stable')
+    codes, starts = np.unique(epsg[order], return_index=True)
+    for code, idx in zip(codes, np.split(order, starts[1:])):
+        code = int(code)
+        x[idx], y[idx] = _transform(longitude[idx], latitude[idx], 4326,
+                                    code, polar=(code % 100 == 61))
+
+    ups = (latitude < -80) | (latitude > 84)
+    utm = ~ups
+
+    zones = np.where(ups, 0, zone)
+    letters = np.empty((3, len(latitude)), dtype=np.int64)
+    easting = x.copy()
+    northing = y.copy()
+    if np.any(ups):
+        letters[:, ups] = _upsToMgrsArray(north[ups], x[ups], y[ups])
+    if np.any(utm):
+        letters[:, utm], easting[utm], northing[utm] = _utmToMgrsArray(
+            zone[utm], latitude[utm], x[utm], y[utm])
+
+    return _mgrsStrings(zones, letters, easting, northing, precision)
+
+
+# Below this product of the degrees from the pole and the sine of the
+# longitude, the UPS easting of a point rounds to the prime or antimeridian
+# and gzdOf takes its letter from the encoder
+_UPS_MERIDIAN_EDGE = 1e-12
+
+# Grid zone designators indexed by zone * 26 + latitude band letter, zone 0
+# holding the UPS letters; built on the first array lookup
+_gzdTable = None
+
+
+def gzdOf(latitude, longitude):
+    """ Returns the MGRS grid zone designator of geodetic coordinates, such
+    as '18S', or 'A', 'B', 'Y' or 'Z' in the polar regions. It is worked out
+    from the zone and latitude band tables only, without any coordinate
+    transformation, except for polar points on the prime meridian, the
+    antimeridian or a pole, whose letter is taken from the encoder so that
+    it always matches squareOf.
+
+    @param latitude - latitude value, or sequence or NumPy array of values
+    @param longitude - longitude value, or sequence or NumPy array of values
+    @returns - grid zone designator string, or list of strings for arrays
+    """
+    if _isBatch(latitude) or _isBatch(longitude):
+        return _gzdOfArray(latitude, longitude)
+
+    if math.fabs(latitude) > 90:
+        raise MgrsException(
+            'Latitude outside of valid range (-90 to 90 degrees).')
+
+    if (longitude < -180) or (longitude > 360):
+        raise MgrsException(
+            'Longitude outside of valid range (-180 to 360 degrees).')
+
+    if (latitude < -80) or (latitude > 84):
+        # UPS letters: A and Y west of the prime meridian, B and Z east
+        lon = (longitude + 180.0) % 360.0 - 180.0
+        if (90.0 - math.fabs(latitude)) * \
+                math.fabs(math.sin(math.radians(lon))) < _UPS_MERIDIAN_EDGE:
+            # On the prime meridian, the antimeridian or a pole the letter
+            # follows the rounding of the projected easting, so it is taken
+            # from the encoder
+            return toMgrs(latitude, longitude, 0).lstrip()[0]
+        east = lon >= 0
+        if latitude > 0:
+            return 'Z' if east else 'Y'
+        return 'B' if east else 'A'
+
+    hemisphere, zone, epsg = _epsgForWgs(latitude, longitude)
+    return '{:02d}{}'.format(zone, _LETTERS[_latitudeLetter(latitude)])
+
+
+def _gzdOfArray(latitudes, longitudes):
+    """ Vectorized version of gzdOf, a linear pass over the arrays ending in
+    a lookup of the designators in _gzdTable """
+    global _gzdTable
+    _requireNumpy()
+    latitude = np.asarray(latitudes, dtype=np.float64).ravel()
+    longitude = np.asarray(longitudes, dtype=np.float64).ravel()
+    if latitude.shape != longitude.shape:
+        raise MgrsException(
+            'Latitude and longitude arrays must have the same length.')
+    _checkRange(latitude, longitude)
+
+    if _gzdTable is None:
+        table = [''] * (61 * 26)
+        for letter in 'ABYZ':
+            table[ALPHABET[letter]] = letter
+        for zone in range(1, 61):
+            for band in LATITUDE_BANDS:
+                table[zone * 26 + band[0]] = \
+                    '{:02d}{}'.format(zone, _LETTERS[band[0]])
+        _gzdTable = np.array(table)
+
+    north, zone, epsg = _epsgForWgsArray(latitude, longitude)
+    ups = (latitude < -80) | (latitude > 84)
+    utm = ~ups
+    letters = np.empty(len(latitude), dtype=np.int64)
+    if np.any(utm):
+        letters[utm] = _latitudeLetterArray(latitude[utm])
+    if np.any(ups):
+        lon = np.mod(longitude + 180.0, 360.0) - 180.0
+        east = lon >= 0
+        letters[ups] = np.where(
+            latitude[ups] > 0,
+            np.where(east[ups], ALPHABET['Z'], ALPHABET['Y']),
+            np.where(east[ups], ALPHABET['B'], ALPHABET['A']))
+        edge = ups & ((90.0 - np.fabs(latitude))
+                      * np.fabs(np.sin(np.radians(lon))) < _UPS_MERIDIAN_EDGE)
+        if np.any(edge):
+            # Letters following the rounding of the projected easting
+            letters[edge] = [
+                ALPHABET[square.lstrip()[0]] for square in toMgrsBatch(
+                    latitude[edge], longitude[edge], 0)]
+        zone[ups] = 0
+    return _gzdTable[zone * 26 + letters].tolist()
+
+
+def squareOf(latitude, longitude):
+    """ Returns the MGRS 100 km grid square identifier of geodetic
+    coordinates, such as '18SUJ', or 'ZAH' in the polar regions. This is the
+    MGRS coordinate string at precision 0.
+
+    @param latitude - latitude value, or sequence or NumPy array of values
+    @param longitude - longitude value, or sequence or NumPy array of values
+    @returns - grid square string, or list of strings for arrays
+    """
+    if _isBatch(latitude) or _isBatch(longitude):
+        return [square.lstrip()
+                for square in toMgrsBatch(latitude, longitude, 0)]
+    return toMgrs(latitude, longitude, 0).lstrip()
+
+
+def parse(mgrs):
+    """ Parses an MGRS coordinate string in a single pass. Whitespace is
+    ignored, the zone may have one or two digits and is omitted for UPS.
+
+    @param mgrs - MGRS coordinate string
+    @returns - MgrsCoordinate tuple with the zone (0 for UPS), latitude
+    band, column and row letters, easting and northing within the 100 km
+    square in meters and precision
+    """
+    coord = _parseMgrs(mgrs)
+    if coord is None:
+        raise MgrsException(BADLY_FORMED)
+    return coord
+
+
+def isValid(mgrs):
+    """ Checks whether an MGRS coordinate string can be decoded, without
+    doing the coordinate transformation
+
+    @param mgrs - MGRS coordinate string
+    @returns - True if toWgs would decode the string, False otherwise
+    """
+    coord = _parseMgrs(mgrs)
+    if coord is None:
+        return False
+    try:
+        if coord.zone:
+            _mgrsToUtm(coord)
+        else:
+            _mgrsToUps(coord)
+    except MgrsException:
+        return False
+    return True
+
+
+@_stage('toWgs')
 def toWgs(mgrs):
     """ Converts an MGRS coordinate string to geodetic (latitude and longitude)
     coordinates
 
-    @param mgrs - MGRS coordinate string
+    @param mgrs - MGRS coordinate string or MgrsCoordinate returned by parse
     @returns - tuple containning latitude and longitude values
     """
-    mgrs = _clean_mgrs_str(mgrs)
-    log.debug('in: {0}'.format(mgrs))
-
-    utm = _checkZone(mgrs)
+    coord = mgrs if isinstance(mgrs, MgrsCoordinate) else parse(mgrs)
+    log.debug('in: %s', coord)
+    cached = _wgsCache.maxsize != 0
+    if cached:
+        result = _wgsCache.get(coord)
+        if result is not None:
+            return result
+
+    utm = coord.zone != 0
     if utm:
-        zone, hemisphere, easting, northing = _mgrsToUtm(mgrs)
+        zone, hemisphere, easting, northing = _mgrsToUtm(coord)
     else:
-        zone, hemisphere, easting, northing = _mgrsToUps(mgrs)
+        zone, hemisphere, easting, northing = _mgrsToUps(coord)
 
-    log.debug('e: {0}, n: {1}'.format(easting, northing))
+    log.debug('e: %s, n: %s', easting, northing)
 
     epsg = _epsgForUtm(zone, hemisphere)
 
@@ -263,11 +1180,389 @@ def toWgs(mgrs):
         _transform(easting, northing, epsg, 4326, polar=(not utm))
 
     # Note y, x axis order for output
-    log.debug('lat: {0}, lon: {1}'.format(latitude, longitude))
+    log.debug('lat: %s, lon: %s', latitude, longitude)
 
+    if cached:
+        _wgsCache.put(coord, (latitude, longitude))
     return latitude, longitude
 
 
+@_stage('toWgsBatch')
+def toWgsBatch(mgrs):
+    """ Converts a sequence of MGRS coordinate strings to geodetic (latitude
+    and longitude) coordinates. Strings are parsed into zone, letter and
+    digit arrays, eastings and northings are rebuilt on whole arrays and
+    every UTM/UPS zone is transformed with a single call. Invalid strings
+    do not raise, they are flagged in the returned validity mask.
+
+    @param mgrs - sequence of MGRS coordinate strings
+    @returns - tuple containing latitude and longitude arrays (float64, NaN
+    where invalid) and a boolean array that is True for valid strings
+    """
+    _requireNumpy()
+    valid, zone, letters, easting, northing, precision = \
+        _parseMgrsStrings(mgrs)
+    epsg, easting, northing = _gridArrays(
+        valid, zone, letters, easting, northing)
+    longitude, latitude = _transformToWgsArrays(epsg, easting, northing)
+
+    # Note y, x axis order for output
+    return latitude, longitude, epsg != 0
+
+
+def _gridArrays(valid, zone, letters, easting, northing):
+    """ Converts parsed MGRS strings to UTM/UPS coordinates
+
+    @returns - tuple containing the EPSG codes (0 where invalid), the
+    eastings and the northings
+    """
+    north = np.zeros(len(valid), dtype=bool)
+    utm = valid & (zone != 0)
+    ups = valid & (zone == 0)
+    if np.any(utm):
+        ok, north[utm], easting[utm], northing[utm] = _mgrsToUtmArray(
+            zone[utm], letters[:, utm], easting[utm], northing[utm])
+        valid[utm] = ok
+    if np.any(ups):
+        ok, north[ups], easting[ups], northing[ups] = _mgrsToUpsArray(
+            letters[:, ups], easting[ups], northing[ups])
+        valid[ups] = ok
+
+    epsg = 32000 + np.where(north, 600, 700) + np.where(zone == 0, 61, zone)
+    epsg[~valid] = 0
+    return epsg, easting, northing
+
+
+def _transformToWgsArrays(epsg, easting, northing):
+    """ Transforms UTM/UPS coordinate arrays to longitude and latitude
+    arrays with a single call per EPSG code, leaving NaN where the code is 0
+    """
+    longitude = np.full(len(epsg), np.nan)
+    latitude = np.full(len(epsg), np.nan)
+    order = np.argsort(epsg, kind='stable')
+    codes, starts = np.unique(epsg[order], return_index=True)
+    for code, idx in zip(codes, np.split(order, starts[1:])):
+        code = int(code)
+        if code == 0:
+            continue
+        longitude[idx], latitude[idx] = _transform(
+            easting[idx], northing[idx], code, 4326, polar=(code % 100 == 61))
+    return longitude, latitude
+
+
+def cellBounds(mgrs, densify=0):
+    """ Returns the footprint polygon of the cell of each MGRS coordinate
+    string, such as the 1 km square of a precision 2 string. Each string is
+    decoded once, the corners of its cell are derived from its precision
+    and the corners of all the cells of a UTM/UPS zone are transformed with
+    a single call. UTM cells are clipped at the edges of their grid zone
+    designator. UPS cells are not clipped; their longitudes are kept
+    continuous and the cells touching a pole follow the pole line, so they
+    render as polar caps.
+
+    @param mgrs - sequence of MGRS coordinate strings
+    @param densify - number of vertices added along each edge of the cells
+    @returns - list holding for each string its closed ring as a list of
+    (longitude, latitude) tuples, or None if the string is invalid or its
+    cell lies outside of its grid zone designator
+    """
+    _requireNumpy()
+    valid, zone, letters, easting, northing, precision = \
+        _parseMgrsStrings(mgrs)
+    size = np.array(_SCALES)[precision]
+    if GEOTRANS_HALFMULTI:
+        # The parsed values are the cell centers
+        half = np.where(precision > 0, size * 0.5, 0.0)
+        easting -= half
+        northing -= half
+    epsg, easting, northing = _gridArrays(
+        valid, zone, letters, easting, northing)
+
+    segments = max(int(densify), 0) + 1
+    t = np.linspace(0.0, 1.0, segments + 1)[:-1]
+    ox = np.concatenate((t, np.ones(segments), 1.0 - t, np.zeros(segments),
+                         [0.0]))
+    oy = np.concatenate((np.zeros(segments), t, np.ones(segments), 1.0 - t,
+                         [0.0]))
+    x = easting[:, None] + ox * size[:, None]
+    y = northing[:, None] + oy * size[:, None]
+    lon, lat = _transformToWgsArrays(
+        np.repeat(epsg, len(ox)), x.ravel(), y.ravel())
+    lon = lon.reshape(x.shape)
+    lat = lat.reshape(y.shape)
+
+    utm = (epsg != 0) & (zone != 0)
+    rects = np.zeros((len(epsg), 4))
+    if np.any(utm):
+        # Keep the cells at the antimeridian continuous around their zone
+        centralMeridian = (zone[utm] * 6 - 183)[:, None]
+        lon[utm] = centralMeridian + \
+            np.mod(lon[utm] - centralMeridian + 180.0, 360.0) - 180.0
+        keys, index = np.unique(zone[utm] * 26 + letters[0, utm],
+                                return_inverse=True)
+        rects[utm] = np.array([_gzdRectangle(key // 26, key % 26)
+                               for key in keys.tolist()])[index.ravel()]
+    inside = ~utm | (
+        (lon.min(axis=1) >= rects[:, 0]) & (lat.min(axis=1) >= rects[:, 1])
+        & (lon.max(axis=1) <= rects[:, 2]) & (lat.max(axis=1) <= rects[:, 3]))
+    ups = (epsg != 0) & (zone == 0)
+    atPole = ups[:, None] & (x == TWOMIL) & (y == TWOMIL)
+
+    result = []
+    for code, isUps, isInside, x, y, rect, pole in zip(
+            epsg.tolist(), ups.tolist(), inside.tolist(), lon.tolist(),
+            lat.tolist(), rects.tolist(), atPole.tolist()):
+        if code == 0:
+            result.append(None)
+            continue
+        ring = list(zip(x, y))
+        if isUps:
+            ring = _polarRing(ring[:-1], pole[:-1], code % 1000 == 661)
+            ring.append(ring[0])
+        elif not isInside:
+            ring = _clipRing(ring[:-1], *rect)
+            if len(ring) < 3:
+                result.append(None)
+                continue
+            ring.append(ring[0])
+        result.append(ring)
+    return result
+
+
+def _polarRing(ring, pole, north):
+    """ Makes a UPS cell ring, a list of (longitude, latitude) tuples
+    without the closing point, continuous in longitude. Each vertex lying
+    on the pole is replaced by the pole line between the longitudes of its
+    neighbours, and a ring going around the pole is closed along the pole
+    line.
+
+    @param ring - list of (longitude, latitude) tuples
+    @param pole - list of booleans, True for the vertices on the pole
+    @param north - True for the north pole
+    @returns - the new ring, without the closing point
+    """
+    poleLat = 90.0 if north else -90.0
+    # Start on a vertex off the pole
+    start = pole.index(False)
+    ring = ring[start:] + ring[:start]
+    pole = pole[start:] + pole[:start]
+
+    result = []
+    previous = ring[0][0]
+    onPole = False
+    for (x, y), isPole in zip(ring, pole):
+        if isPole:
+            onPole = True
+            continue
+        x = previous + (x - previous + 180.0) % 360.0 - 180.0
+        if onPole:
+            result.append((previous, poleLat))
+            result.append((x, poleLat))
+            onPole = False
+        result.append((x, y))
+        previous = x
+    first, firstLat = result[0]
+    last = previous + (first - previous + 180.0) % 360.0 - 180.0
+    if onPole:
+        result.append((previous, poleLat))
+        result.append((last, poleLat))
+    elif abs(last - first) > 180.0:
+        # The ring goes around the pole
+        result.append((last, firstLat))
+        result.append((last, poleLat))
+        result.append((first, poleLat))
+    return result
+
+
+def _gzdRectangle(zone, letter):
+    """ Returns the (west, south, east, north) degree bounds of a UTM grid
+    zone designator """
+    band = LATITUDE_BANDS[[b[0] for b in LATITUDE_BANDS].index(letter)]
+    west, east = _SPECIAL_ZONES.get(
+        (_LETTERS[letter], zone), (zone * 6.0 - 186.0, zone * 6.0 - 180.0))
+    return west, max(band[3], -80.0), east, min(band[2], 84.0)
+
+
+def _clipRing(ring, xmin, ymin, xmax, ymax):
+    """ Clips a polygon ring, a list of (x, y) tuples without the closing
+    point, to a rectangle with the Sutherland-Hodgman algorithm """
+    edges = ((0, xmin, True), (1, ymin, True), (0, xmax, False),
+             (1, ymax, False))
+    for axis, bound, lower in edges:
+        if not ring:
+            break
+        points = ring
+        ring = []
+        previous = points[-1]
+        previousIn = (previous[axis] >= bound) == lower \
+            or previous[axis] == bound
+        for point in points:
+            pointIn = (point[axis] >= bound) == lower or point[axis] == bound
+            if pointIn != previousIn and point[axis] != bound \
+                    and previous[axis] != bound:
+                # Add the intersection of the segment with the edge
+                f = (bound - previous[axis]) / (point[axis] - previous[axis])
+                other = 1 - axis
+                crossing = [0.0, 0.0]
+                crossing[axis] = bound
+                crossing[other] = previous[other] + \
+                    f * (point[other] - previous[other])
+                ring.append(tuple(crossing))
+            if pointIn:
+                ring.append(point)
+            previous = point
+            previousIn = pointIn
+    return ring
+
+
+def _checkErrors(errors):
+    if errors not in ('raise', 'skip', 'none'):
+        raise MgrsException(
+            "errors must be 'raise', 'skip' or 'none', not {0}".format(errors))
+
+
+def _chunks(iterable, chunkSize):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, max(int(chunkSize), 1)))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iterToMgrs(coordinates, precision=5, chunkSize=10000, errors='raise'):
+    """ Converts an iterable of (latitude, longitude) pairs to MGRS
+    coordinate strings lazily. Coordinates are pulled and converted
+    chunkSize at a time, with toMgrsBatch if NumPy is available, so memory
+    use is bounded whatever the length of the input.
+
+    @param coordinates - iterable of (latitude, longitude) pairs
+    @param precision - precision level of MGRS strings
+    @param chunkSize - number of coordinates converted at a time
+    @param errors - what to do with a coordinate that cannot be converted:
+        'raise' its exception, 'skip' it or yield None for it
+    @returns - generator of MGRS coordinate strings, in input order
+    """
+    _checkErrors(errors)
+    if (precision < 0) or (precision > MAX_PRECISION):
+        raise MgrsException('The precision must be between 0 and 5 inclusive.')
+    batch = _loadNumpy()
+    for chunk in _chunks(coordinates, chunkSize):
+        index = []
+        latitudes = []
+        longitudes = []
+        for i, item in enumerate(chunk):
+            try:
+                latitude, longitude = item
+                latitude = float(latitude)
+                longitude = float(longitude)
+            except (TypeError, ValueError):
+                continue
+            if math.fabs(latitude) <= 90 and -180 <= longitude <= 360:
+                index.append(i)
+                latitudes.append(latitude)
+                longitudes.append(longitude)
+
+        results = [None] * len(chunk)
+        strings = None
+        if batch and index:
+            try:
+                strings = toMgrsBatch(latitudes, longitudes, precision)
+            except MgrsException:
+                # An item of the chunk cannot be converted, convert the
+                # chunk one item at a time
+                pass
+        if strings is None:
+            strings = []
+            for latitude, longitude in zip(latitudes, longitudes):
+                try:
+                    strings.append(toMgrs(latitude, longitude, precision))
+                except MgrsException:
+                    strings.append(None)
+        for i, s in zip(index, strings):
+            results[i] = s
+
+        for item, result in zip(chunk, results):
+            if result is not None:
+                yield result
+            elif errors == 'raise':
+                # Raise the error the scalar conversion gives for the item
+                latitude, longitude = item
+                toMgrs(latitude, longitude, precision)
+                raise MgrsException(BADLY_FORMED)
+            elif errors == 'none':
+                yield None
+
+
+def iterToWgs(mgrs, chunkSize=10000, errors='raise'):
+    """ Converts an iterable of MGRS coordinate strings to geodetic (latitude
+    and longitude) coordinates lazily. Strings are pulled and converted
+    chunkSize at a time, with toWgsBatch if NumPy is available, so memory
+    use is bounded whatever the length of the input.
+
+    @param mgrs - iterable of MGRS coordinate strings
+    @param chunkSize - number of strings converted at a time
+    @param errors - what to do with a string that cannot be decoded:
+        'raise' its exception, 'skip' it or yield None for it
+    @returns - generator of (latitude, longitude) tuples, in input order
+    """
+    _checkErrors(errors)
+    batch = _loadNumpy()
+    for chunk in _chunks(mgrs, chunkSize):
+        if batch:
+            latitude, longitude, valid = toWgsBatch(chunk)
+            results = [(lat, lon) if ok else None for lat, lon, ok in zip(
+                latitude.tolist(), longitude.tolist(), valid.tolist())]
+        else:
+            results = []
+            for s in chunk:
+                try:
+                    results.append(toWgs(s))
+                except MgrsException:
+                    results.append(None)
+
+        for s, result in zip(chunk, results):
+            if result is not None:
+                yield result
+            elif errors == 'raise':
+                # Raise the error the scalar conversion gives for the string
+                toWgs(s)
+                raise MgrsException(BADLY_FORMED)
+            elif errors == 'none':
+                yield None
+
+
+def utmToWgs(zone, hemisphere, easting, northing):
+    """ Converts UTM or UPS coordinates to geodetic (latitude and longitude)
+    coordinates
+
+    @param zone - UTM zone number, 0 for UPS
+    @param hemisphere - hemisphere either 'N' or 'S'
+    @param easting - easting value(s) in meters, scalar or NumPy array
+    @param northing - northing value(s) in meters, scalar or NumPy array
+    @returns - tuple containing latitude(s) and longitude(s)
+    """
+    epsg = _epsgForUtm(zone, hemisphere)
+    longitude, latitude = \
+        _transform(easting, northing, epsg, 4326, polar=(zone == 0))
+    return latitude, longitude
+
+
+def wgsToUtm(zone, hemisphere, latitude, longitude):
+    """ Converts geodetic (latitude and longitude) coordinates to the given
+    UTM zone or UPS, even when they lie outside of that zone
+
+    @param zone - UTM zone number, 0 for UPS
+    @param hemisphere - hemisphere either 'N' or 'S'
+    @param latitude - latitude value(s), scalar or NumPy array
+    @param longitude - longitude value(s), scalar or NumPy array
+    @returns - tuple containing easting(s) and northing(s)
+    """
+    epsg = _epsgForUtm(zone, hemisphere)
+    return _transform(longitude, latitude, 4326, epsg, polar=(zone == 0))
+
+
+@_stage('format')
 def _upsToMgrs(hemisphere, easting, northing, precision):
     """ Converts UPS (hemisphere, easting, and northing) coordinates
     to an MGRS coordinate string.
@@ -349,16 +1644,62 @@ def _upsToMgrs(hemisphere, easting, northing, precision):
     return _mgrsString(0, letters, easting, northing, precision)
 
 
-def _mgrsToUps(mgrs):
-    """ Converts an MGRS coordinate string to UTM projection (zone, hemisphere,
+@_stage('format')
+def _upsToMgrsArray(north, easting, northing):
+    """ Vectorized version of _upsToMgrs, computing the MGRS letters only.
+
+    @param north - boolean array, True for the northern hemisphere
+    @param easting - array of eastings/X in meters
+    @param northing - array of northings/Y in meters
+    @returns - array of shape (3, n) with the MGRS letters
+    """
+    if np.any((easting < MIN_EAST_NORTH) | (easting > MAX_EAST_NORTH)):
+        raise MgrsException(
+            'Easting outside of valid range (100,000 to 900,000 meters '
+            'for UTM, 0 to 4,000,000 meters for UPS).')
+
+    if np.any((northing < MIN_EAST_NORTH) | (northing > MAX_EAST_NORTH)):
+        raise MgrsException(
+            'Northing outside of valid range (0 to 10,000,000 meters for UTM, '
+            '0 to 4,000,000 meters for UPS).')
+
+    east = easting >= TWOMIL
+    letter1 = np.where(north,
+                       np.where(east, ALPHABET['Z'], ALPHABET['Y']),
+                       np.where(east, ALPHABET['B'], ALPHABET['A']))
+    idx = np.where(north, letter1 - 22, letter1)
+    constants = np.array([UPS_CONSTANTS[i] for i in range(4)])
+    ltr2LowValue = constants[idx, 1].astype(np.int64)
+    falseEasting = constants[idx, 4]
+    falseNorthing = constants[idx, 5]
+
+    letter3 = np.trunc((northing - falseNorthing) / ONEHT).astype(np.int64)
+    letter3 += letter3 > ALPHABET['H']
+    letter3 += letter3 > ALPHABET['N']
+
+    letter2 = ltr2LowValue + np.trunc(
+        (easting - falseEasting) / ONEHT).astype(np.int64)
+    west = ~east
+    letter2 += 3 * (west & (letter2 > ALPHABET['L']))
+    letter2 += 2 * (west & (letter2 > ALPHABET['U']))
+    letter2 += 2 * (east & (letter2 > ALPHABET['C']))
+    letter2 += east & (letter2 > ALPHABET['H'])
+    letter2 += 3 * (east & (letter2 > ALPHABET['L']))
+
+    return np.array([letter1, letter2, letter3], dtype=np.int64)
+
+
+@_stage('grid')
+def _mgrsToUps(coord):
+    """ Converts a parsed MGRS coordinate to UPS projection (zone, hemisphere,
     easting and northing) coordinates
 
-    @param mgrs - MGRS coordinate string
+    @param coord - MgrsCoordinate returned by parse
     @returns - tuple containing UTM zone, hemisphere, easting and northing
     """
-    zone, letters, easting, northing, precision = _breakMgrsString(mgrs)
+    zone, letters, easting, northing = _coordinateLetters(coord)
 
-    if zone != 0:
+    if zone != 0 or _LETTERS[letters[0]] not in 'ABYZ':
         raise MgrsException(BADLY_FORMED)
 
     if letters[0] >= ALPHABET['Y']:
@@ -425,6 +1766,52 @@ def _mgrsToUps(mgrs):
     return zone, hemisphere, easting, northing
 
 
+@_stage('grid')
+def _mgrsToUpsArray(letters, easting, northing):
+    """ Vectorized version of _mgrsToUps, working on already parsed MGRS
+    strings. As in _mgrsToUps, a first letter other than A, B, Y or Z is
+    rejected.
+
+    @param letters - array of shape (3, n) with the MGRS letters
+    @param easting - array of easting digits values in meters
+    @param northing - array of northing digits values in meters
+    @returns - tuple containing the validity mask, a boolean array (True for
+    the northern hemisphere), the eastings and the northings
+    """
+    north = letters[0] >= ALPHABET['Y']
+    valid = np.isin(letters[0], [ALPHABET[letter] for letter in 'ABYZ'])
+    idx = np.where(valid, np.where(north, letters[0] - 22, letters[0]), 0)
+
+    constants = np.array([UPS_CONSTANTS[i] for i in range(4)])
+    ltr2LowValue = constants[idx, 1].astype(np.int64)
+    ltr2HighValue = constants[idx, 2].astype(np.int64)
+    ltr3HighValue = constants[idx, 3].astype(np.int64)
+    falseEasting = constants[idx, 4]
+    falseNorthing = constants[idx, 5]
+
+    valid &= (letters[1] >= ltr2LowValue) & (letters[1] <= ltr2HighValue) \
+        & (letters[2] <= ltr3HighValue)
+
+    gridNorthing = letters[2] * ONEHT + falseNorthing
+    gridNorthing -= np.where(letters[2] > ALPHABET['I'], ONEHT, 0.0)
+    gridNorthing -= np.where(letters[2] > ALPHABET['O'], ONEHT, 0.0)
+
+    gridEasting = (letters[1] - ltr2LowValue) * ONEHT + falseEasting
+    lowA = ltr2LowValue == ALPHABET['A']
+    gridEasting -= np.where(~lowA & (letters[1] > ALPHABET['L']),
+                            300000.0, 0.0)
+    gridEasting -= np.where(~lowA & (letters[1] > ALPHABET['U']),
+                            200000.0, 0.0)
+    gridEasting -= np.where(lowA & (letters[1] > ALPHABET['C']),
+                            200000.0, 0.0)
+    gridEasting -= np.where(lowA & (letters[1] > ALPHABET['I']), ONEHT, 0.0)
+    gridEasting -= np.where(lowA & (letters[1] > ALPHABET['L']),
+                            300000.0, 0.0)
+
+    return valid, north, easting + gridEasting, northing + gridNorthing
+
+
+@_stage('format')
 def _utmToMgrs(zone, hemisphere, latitude, longitude,
                easting, northing, precision):
     """ Calculates an MGRS coordinate string based on the UTM zone, latitude,
@@ -479,7 +1866,16 @@ def _utmToMgrs(zone, hemisphere, latitude, longitude,
 
     ltr2LowValue, ltr2HighValue, patternOffset = _gridValues(zone)
 
-    letters = [_latitudeLetter(latitude), None, None]
+    return _utmGridToMgrs(zone, _latitudeLetter(latitude), ltr2LowValue,
+                          patternOffset, easting, northing, precision)
+
+
+def _utmGridToMgrs(zone, letter, ltr2LowValue, patternOffset,
+                   easting, northing, precision):
+    """ Calculates an MGRS coordinate string from the UTM zone, latitude
+    band letter and grid values of the zone, easting and northing values.
+    """
+    letters = [letter, None, None]
 
     while northing >= TWOMIL:
         northing = northing - TWOMIL
@@ -506,14 +1902,54 @@ def _utmToMgrs(zone, hemisphere, latitude, longitude,
     return _mgrsString(zone, letters, easting, northing, precision)
 
 
-def _mgrsToUtm(mgrs):
-    """ Converts an MGRS coordinate string to UTM projection (zone, hemisphere,
+@_stage('format')
+def _utmToMgrsArray(zone, latitude, easting, northing):
+    """ Vectorized version of _utmToMgrs, computing the MGRS letters and the
+    adjusted easting and northing passed on to the string formatting.
+
+    @param zone - array of UTM zone numbers
+    @param latitude - array of latitude values
+    @param easting - array of eastings/X in meters
+    @param northing - array of northings/Y in meters
+    @returns - tuple containing an array of shape (3, n) with the MGRS
+    letters, the eastings and the northings
+    """
+    reset = (latitude <= 0.0) & (northing == 1.0e7)
+    latitude = np.where(reset, 0.0, latitude)
+    northing = np.where(reset, 0.0, northing)
+
+    ltr2LowValue, ltr2HighValue, patternOffset = _gridValuesArray(zone)
+
+    letter1 = _latitudeLetterArray(latitude)
+
+    northing = np.where(northing >= TWOMIL, np.fmod(northing, TWOMIL),
+                        northing)
+    northing = northing + patternOffset
+    northing = np.where(northing >= TWOMIL, northing - TWOMIL, northing)
+
+    letter3 = np.trunc(northing / ONEHT).astype(np.int64)
+    letter3 += letter3 > ALPHABET['H']
+    letter3 += letter3 > ALPHABET['N']
+
+    easting = np.where((letter1 == ALPHABET['V']) & (zone == 31)
+                       & (easting == 500000.0), easting - 1.0, easting)
+
+    letter2 = ltr2LowValue + np.trunc((easting / ONEHT) - 1).astype(np.int64)
+    letter2 += (ltr2LowValue == ALPHABET['J']) & (letter2 > ALPHABET['N'])
+
+    letters = np.array([letter1, letter2, letter3], dtype=np.int64)
+    return letters, easting, northing
+
+
+@_stage('grid')
+def _mgrsToUtm(coord):
+    """ Converts a parsed MGRS coordinate to UTM projection (zone, hemisphere,
     easting and northing) coordinates.
 
-    @param mgrs - MGRS coordinate string
+    @param coord - MgrsCoordinate returned by parse
     @returns - tuple containing UTM zone, hemisphere, easting, northing
     """
-    zone, letters, easting, northing, precision = _breakMgrsString(mgrs)
+    zone, letters, easting, northing = _coordinateLetters(coord)
     if zone == 0:
         raise MgrsException(BADLY_FORMED)
 
@@ -565,6 +2001,50 @@ def _mgrsToUtm(mgrs):
     return zone, hemisphere, easting, northing
 
 
+@_stage('grid')
+def _mgrsToUtmArray(zone, letters, easting, northing):
+    """ Vectorized version of _mgrsToUtm, working on already parsed MGRS
+    strings.
+
+    @param zone - array of UTM zone numbers
+    @param letters - array of shape (3, n) with the MGRS letters
+    @param easting - array of easting digits values in meters
+    @param northing - array of northing digits values in meters
+    @returns - tuple containing the validity mask, a boolean array (True for
+    the northern hemisphere), the eastings and the northings
+    """
+    north = letters[0] >= ALPHABET['N']
+
+    ltr2LowValue, ltr2HighValue, patternOffset = _gridValuesArray(zone)
+
+    # Check that the second letter of the MGRS string is within the range
+    # of valid second letter values. Also check that the third letter is valid
+    valid = (letters[1] >= ltr2LowValue) & (letters[1] <= ltr2HighValue) \
+        & (letters[2] <= ALPHABET['V'])
+
+    rowLetterNorthing = letters[2] * ONEHT
+    gridEasting = (letters[1] - ltr2LowValue + 1) * ONEHT
+    gridEasting -= np.where((ltr2LowValue == ALPHABET['J'])
+                            & (letters[1] > ALPHABET['O']), ONEHT, 0.0)
+
+    rowLetterNorthing -= np.where(letters[2] > ALPHABET['O'], ONEHT, 0.0)
+    rowLetterNorthing -= np.where(letters[2] > ALPHABET['I'], ONEHT, 0.0)
+    rowLetterNorthing -= np.where(rowLetterNorthing >= TWOMIL, TWOMIL, 0.0)
+
+    ok, minNorthing, northingOffset = _latitudeBandMinNorthingArray(
+        letters[0])
+    valid &= ok
+
+    gridNorthing = rowLetterNorthing - patternOffset
+    gridNorthing += np.where(gridNorthing < 0, TWOMIL, 0.0)
+
+    gridNorthing += northingOffset
+
+    gridNorthing += np.where(gridNorthing < minNorthing, TWOMIL, 0.0)
+
+    return valid, north, easting + gridEasting, northing + gridNorthing
+
+
 def _mgrsString(zone, letters, easting, northing, precision):
     """ Constructs an MGRS string from its component parts
     @param zone - UTM zone
@@ -580,10 +2060,8 @@ def _mgrsString(zone, letters, easting, northing, precision):
     else:
         mgrs = '  '
 
-    for i in range(3):
-        mgrs += list(ALPHABET.keys())[
-            list(ALPHABET.values()).index(letters[i])
-        ]
+    mgrs += _LETTER_OF[letters[0]] + _LETTER_OF[letters[1]] + \
+        _LETTER_OF[letters[2]]
 
     easting = math.fmod(easting + 1e-8, 100000.0)
     if easting >= 99999.5:
@@ -595,11 +2073,44 @@ def _mgrsString(zone, letters, easting, northing, precision):
         northing = 99999.0
     mgrs += str(int(northing)).rjust(5, '0')[:precision]
 
-    log.debug('mgrs: {0}'.format(mgrs))
+    log.debug('mgrs: %s', mgrs)
 
     return mgrs
 
 
+@_stage('format')
+def _mgrsStrings(zone, letters, easting, northing, precision):
+    """ Vectorized version of _mgrsString
+    @param zone - array of UTM zones, 0 for UPS
+    @param letters - array of shape (3, n) with the MGRS letters
+    @param easting - array of easting values
+    @param northing - array of northing values
+    @param precision - precision level of MGRS strings
+    @returns - list of MGRS coordinate strings
+    """
+    if np.any((letters < 0) | (letters >= len(_LETTERS))):
+        raise MgrsException(BADLY_FORMED)
+
+    chars = np.array(list(_LETTERS))
+    zones = ['  ' if z == 0 else '{0:02d}'.format(z) for z in zone.tolist()]
+    letters = [''.join(ltrs) for ltrs in zip(
+        *(chars[ltr].tolist() for ltr in letters))]
+
+    easting = np.fmod(easting + 1e-8, 100000.0)
+    easting[easting >= 99999.5] = 99999.0
+    easting = [str(e).rjust(5, '0')[:precision]
+               for e in np.trunc(easting).astype(np.int64).tolist()]
+
+    northing = np.fmod(northing + 1e-8, 100000.0)
+    northing[northing >= 99999.5] = 99999.0
+    northing = [str(n).rjust(5, '0')[:precision]
+                for n in np.trunc(northing).astype(np.int64).tolist()]
+
+    return [z + ltrs + e + n
+            for z, ltrs, e, n in zip(zones, letters, easting, northing)]
+
+
+@_stage('zone')
 def _epsgForWgs(latitude, longitude):
     """ Returns corresponding UTM or UPS EPSG code from WGS84 coordinates
     @param latitude - latitude value
@@ -622,7 +2133,7 @@ def _epsgForWgs(latitude, longitude):
         hemisphere = 'N'
 
     # UTM zone
-    if latitude <= -80 or latitude >= 84:
+    if latitude < -80 or latitude > 84:
         # Coordinates falls under UPS system
         zone = 61
     else:
@@ -639,7 +2150,7 @@ def _epsgForWgs(latitude, longitude):
         if 56.0 <= latitude < 64.0 and 3.0 <= longitude < 12.0:
             zone = 32
 
-        if 72.0 <= latitude < 84.0:
+        if 72.0 <= latitude <= 84.0:
             if 0.0 <= longitude < 9.0:
                 zone = 31
             elif 9.0 <= longitude < 21.0:
@@ -658,6 +2169,39 @@ def _epsgForWgs(latitude, longitude):
     return hemisphere, zone, 32000 + ns + zone
 
 
+@_stage('zone')
+def _epsgForWgsArray(latitude, longitude):
+    """ Vectorized version of _epsgForWgs, for coordinates already checked
+    to be within the valid range.
+
+    @param latitude - array of latitude values
+    @param longitude - array of longitude values
+    @returns - tuple containing boolean array (True for northern
+    hemisphere), array of UTM zones and array of EPSG codes
+    """
+    north = latitude >= 0
+
+    zone = np.where(longitude < 180,
+                    np.trunc(31 + (longitude / 6.0)),
+                    np.trunc((longitude / 6) - 29)).astype(np.int64)
+    zone[zone > 60] = 1
+
+    # Handle UTM special cases
+    zone[(56.0 <= latitude) & (latitude < 64.0)
+         & (3.0 <= longitude) & (longitude < 12.0)] = 32
+
+    svalbard = (72.0 <= latitude) & (latitude <= 84.0)
+    for zoneNumber, west, east in ((31, 0.0, 9.0), (33, 9.0, 21.0),
+                                   (35, 21.0, 33.0), (37, 33.0, 42.0)):
+        zone[svalbard & (west <= longitude) & (longitude < east)] = zoneNumber
+
+    # Coordinates falling under UPS system
+    zone[(latitude < -80) | (latitude > 84)] = 61
+
+    return north, zone, 32000 + np.where(north, 600, 700) + zone
+
+
+@_stage('zone')
 def _epsgForUtm(zone, hemisphere):
     """ Returen EPSG code for given UTM zone and hemisphere
 
@@ -721,6 +2265,25 @@ def _gridValues(zone):
     return ltr2LowValue, ltr2HighValue, patternOffset
 
 
+def _gridValuesArray(zone):
+    """ Vectorized version of _gridValues
+
+    @param zone - array of UTM zone numbers
+    @returns - tuple containing arrays of 2nd letter low number, 2nd letter
+    high number and pattern offset
+    """
+    setNumber = zone % 6
+    setNumber[setNumber == 0] = 6
+
+    lowValues = np.array([0, ALPHABET['A'], ALPHABET['J'], ALPHABET['S']])
+    highValues = np.array([0, ALPHABET['H'], ALPHABET['R'], ALPHABET['Z']])
+    setIndex = np.where(setNumber > 3, setNumber - 3, setNumber)
+
+    patternOffset = np.where(setNumber % 2, 0.0, 500000.0)
+
+    return lowValues[setIndex], highValues[setIndex], patternOffset
+
+
 def _latitudeLetter(latitude):
     """ Returns the latitude band letter for given latitude
 
@@ -734,99 +2297,97 @@ def _latitudeLetter(latitude):
         return LATITUDE_BANDS[idx][0]
 
 
-def _checkZone(mgrs):
-    """ Checks if MGRS coordinate string contains UTM zone definition
+def _latitudeLetterArray(latitude):
+    """ Vectorized version of _latitudeLetter
 
-    @param mgrs - MGRS coordinate string
-    @returns - True if zone is given, False otherwise (or for UPS)
+    @param latitude - array of latitude values
+    @returns - array of latitude band letters
     """
-    mgrs = _clean_mgrs_str(mgrs)  # should always set two zone digits, even UPS
-    count = sum(1 for _ in itertools.takewhile(str.isdigit, mgrs))
-    zone = int(mgrs[:count])
-    if zone == 0:
-        return False
-    if count <= 2:
-        return count > 0
-    else:
+    if np.any((latitude <= -80.5) | (latitude >= 84.5)):
         raise MgrsException(BADLY_FORMED)
 
+    bands = np.array([band[0] for band in LATITUDE_BANDS])
+    idx = np.trunc(((latitude + 80.0) / 8.0) + 1.0e-12).astype(np.int64)
+    letters = bands[np.clip(idx, 0, len(bands) - 1)]
+    letters[(72 <= latitude) & (latitude < 84.5)] = ALPHABET['X']
+    return letters
 
-def _breakMgrsString(mgrs):
-    """ Breaks down an MGRS coordinate string into its component parts.
+
+@_stage('parse')
+def _parseMgrs(mgrs):
+    """ Parses an MGRS coordinate string.
 
     @param mgrs - MGRS coordinate string
-    @returns - tuple containing MGRS string componets: UTM zone,
-    MGRS coordinate string letters, easting, northing and precision
-    """
-    mgrs = _clean_mgrs_str(mgrs)  # should always set two zone digits, even UPS
-    # Number of zone digits
-    count = sum(1 for _ in itertools.takewhile(str.isdigit, mgrs))
-    if count == 2:
-        zone = int(mgrs[:2])
-        if zone < 0 or zone > 60:
-            raise MgrsException(BADLY_FORMED)
+    @returns - MgrsCoordinate, or None if the string is badly formed
+    """
+    if isinstance(mgrs, bytes):
+        mgrs = mgrs.decode()
+    elif not isinstance(mgrs, str):
+        return None
+    m = _MGRS_RE.match(''.join(mgrs.split()))
+    if m is None:
+        return None
+    zoneDigits, letters, digits = m.groups()
+    letters = letters.upper()
+    if 'I' in letters or 'O' in letters:
+        return None
+    zone = int(zoneDigits) if zoneDigits else 0
+    precision = len(digits) // 2
+    if zone > 60 or precision * 2 != len(digits):
+        return None
+    if precision > 0:
+        multiplier = _SCALES[precision]
+        easting = float(digits[:precision]) * multiplier
+        northing = float(digits[precision:]) * multiplier
+        if GEOTRANS_HALFMULTI:
+            half_multi = multiplier * 0.5  # added in geotrans3.8
+            easting += half_multi
+            northing += half_multi
     else:
-        raise MgrsException(BADLY_FORMED)
+        easting = 0.0
+        northing = 0.0
+    return MgrsCoordinate(zone, letters[0], letters[1], letters[2],
+                          easting, northing, precision)
 
-    idx = count
-    # MGRS letters
-    count = sum(1 for _ in itertools.takewhile(
-        str.isalpha, itertools.islice(mgrs, idx, None)))
-    if count == 3:
-        a = ord('A')
-        invalid = [ALPHABET['I'], ALPHABET['O']]
-
-        letters = []
-        ch = ord(mgrs[idx:idx + 1].upper()) - a
-        if ch in invalid:
-            raise MgrsException(BADLY_FORMED)
-        idx += 1
-        letters.append(ch)
-
-        ch = ord(mgrs[idx:idx + 1].upper()) - a
-        if ch in invalid:
-            raise MgrsException(BADLY_FORMED)
-        idx += 1
-        letters.append(ch)
-
-        ch = ord(mgrs[idx:idx + 1].upper()) - a
-        if ch in invalid:
-            raise MgrsException(BADLY_FORMED)
-        idx += 1
-        letters.append(ch)
-    else:
-        raise MgrsException(BADLY_FORMED)
 
-    # Easting and Northing
-    count = sum(1 for _ in itertools.takewhile(
-        str.isdigit, itertools.islice(mgrs, idx, None)))
-    if count <= 10 and count % 2 == 0:
-        precision = int(count / 2)
-        if precision > 0:
-            easting = float(mgrs[idx:idx + precision])
-            northing = float(mgrs[idx + precision:])
-
-            multiplier = _computeScale(precision)
-            easting = easting * multiplier
-            northing = northing * multiplier
-
-            if GEOTRANS_HALFMULTI:
-                half_multi = multiplier * 0.5  # added in geotrans3.8
-                easting += half_multi
-                northing += half_multi
-        else:
-            easting = 0.0
-            northing = 0.0
-    else:
-        raise MgrsException(BADLY_FORMED)
+def _coordinateLetters(coord):
+    """ Returns the zone, the list of the letter indexes, the easting and
+    the northing of a parsed MGRS coordinate """
+    letters = [ALPHABET[coord.band], ALPHABET[coord.column],
+               ALPHABET[coord.row]]
+    return coord.zone, letters, coord.easting, coord.northing
+
 
-    log.debug(
-        'zone: "{0}", letters: "{1}", '
-        'easting: "{2}": northing "{3}", precision: "{4}" '.format(
-            zone, letters, easting, northing, precision)
-    )
+def _parseMgrsStrings(mgrs):
+    """ Breaks down a sequence of MGRS coordinate strings into arrays of
+    their component parts.
 
-    return zone, letters, easting, northing, precision
+    @param mgrs - sequence of MGRS coordinate strings
+    @returns - tuple containing the validity mask, the UTM zones (0 for
+    UPS), an array of shape (3, n) with the MGRS letters, the easting and
+    northing arrays and the precisions
+    """
+    count = len(mgrs)
+    valid = np.zeros(count, dtype=bool)
+    zone = np.zeros(count, dtype=np.int64)
+    letters = np.zeros((3, count), dtype=np.int64)
+    easting = np.zeros(count)
+    northing = np.zeros(count)
+    precision = np.zeros(count, dtype=np.int64)
+
+    for i, s in enumerate(mgrs):
+        coord = _parseMgrs(s)
+        if coord is None:
+            continue
+        zone[i] = coord.zone
+        letters[:, i] = (ALPHABET[coord.band], ALPHABET[coord.column],
+                         ALPHABET[coord.row])
+        easting[i] = coord.easting
+        northing[i] = coord.northing
+        precision[i] = coord.precision
+        valid[i] = True
+
+    return valid, zone, letters, easting, northing, precision
 
 
 def _latitudeBandMinNorthing(letter):
@@ -852,51 +2413,36 @@ def _latitudeBandMinNorthing(letter):
     return minNorthing, northingOffset
 
 
-def _computeScale(precision):
-    if precision == 0:
-        return 1.0e5
-    elif precision == 1:
-        return 1.0e4
-    elif precision == 2:
-        return 1.0e3
-    elif precision == 3:
-        return 1.0e2
-    elif precision == 4:
-        return 1.0e1
-    elif precision == 5:
-        return 1.0e0
-    return 1.0e5
-
-
-def _clean_mgrs_str(s):
-    """
-    Clean up MGRS user-input string.
-    :param s: MGRS input string
-    :return: Cleaned and stripped string as Unicode
-    """
-    log.debug('in: {0}'.format(s))
-    if str(type(s)) not in ["<class 'str'>",
-                            "<class 'bytes'>",
-                            "<type 'str'>",
-                            "<type 'unicode'>"]:
-        raise MgrsException(BADLY_FORMED)
+def _latitudeBandMinNorthingArray(letter):
+    """ Vectorized version of _latitudeBandMinNorthing
 
-    # convert to unicode, so str.isdigit, etc work in Py2
-    if str(type(s)) == "<class 'bytes'>":  # Py 3
-        s = s.decode()  # <class 'str'> as UTF-8
-    elif str(type(s)) == "<type 'str'>":  # Py 2
-        s = unicode(s, encoding='UTF-8')  # <type 'unicode'>
-
-    # strip whitespace
-    s = re.sub(r'\s+', '', s)
-
-    # prepend 0 to input of single-digit zone
-    count = sum(1 for _ in itertools.takewhile(str.isdigit, s))
-    if count == 0:
-        s = u'00' + s
-    elif count == 1:
-        s = u'0' + s
-    elif count > 2:
-        raise MgrsException(BADLY_FORMED)
-    log.debug('out: {0}'.format(s))
-    return s
+    @param letter - array of latitude band letters
+    @returns - tuple containing the validity mask, the minimum northings and
+    the northing offsets
+    """
+    idx = np.full(len(letter), -1)
+    idx = np.where((ALPHABET['C'] <= letter) & (letter <= ALPHABET['H']),
+                   letter - 2, idx)
+    idx = np.where((ALPHABET['J'] <= letter) & (letter <= ALPHABET['N']),
+                   letter - 3, idx)
+    idx = np.where((ALPHABET['P'] <= letter) & (letter <= ALPHABET['X']),
+                   letter - 4, idx)
+    valid = idx >= 0
+    idx[~valid] = 0
+
+    bands = np.array(LATITUDE_BANDS)
+    return valid, bands[idx, 1], bands[idx, 4]
+
+
+if os.environ.get('MGRSPY_STATS'):
+    enable_stats()
+if os.environ.get('MGRSPY_CACHE_SIZE'):
+    setConversionCacheSize(int(os.environ['MGRSPY_CACHE_SIZE']))
+
+IMPORT_TIME = time.perf_counter() - _IMPORT_START
+
+
+if __name__ == '__main__':
+    # python -m mgrs, the command line converter
+    import mgrsCli
+    sys.exit(mgrsCli.main())
@@ -0,0 +1,190 @@
+"""
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import itertools
+
+from qgis.PyQt.QtCore import QVariant
+from qgis.core import (
+    QgsCoordinateTransform,
+    QgsFeature,
+    QgsFeatureSink,
+    QgsField,
+    QgsFields,
+    QgsGeometry,
+    QgsLineString,
+    QgsPolygon,
+    QgsProcessing,
+    QgsProcessingException,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterField,
+    QgsProcessingParameterNumber,
+    QgsWkbTypes)
+
+from .settings import epsg4326
+from .pointToMgrs import PointToMgrsAlgorithm
+from . import mgrs
+
+
+class MgrsAggregateAlgorithm(PointToMgrsAlgorithm):
+    """
+    Algorithm to count the points of a layer per MGRS cell, with optional
+    statistics of numeric fields, and output the cell polygons. The points
+    are read and encoded in chunks in a single pass; only the occupied cells
+    are kept in memory.
+    """
+    PrmStatFields = 'StatFields'
+
+    # Statistics computed for each numeric field
+    Stats = ('sum', 'mean', 'min', 'max')
+
+    def initAlgorithm(self, config):
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.PrmInput,
+                'Input point layer',
+                [QgsProcessing.TypeVectorPoint])
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.PrmPrecision,
+                'MGRS precision of the cells (2 for 1 km, 3 for 100 m)',
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=2,
+                minValue=0,
+                maxValue=5)
+        )
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.PrmStatFields,
+                'Numeric fields to summarize',
+                parentLayerParameterName=self.PrmInput,
+                type=QgsProcessingParameterField.Numeric,
+                allowMultiple=True,
+                optional=True)
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.PrmOutput,
+                'MGRS cells',
+                QgsProcessing.TypeVectorPolygon)
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.PrmInput, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.PrmInput))
+        precision = self.parameterAsInt(parameters, self.PrmPrecision, context)
+        stat_fields = self.parameterAsFields(parameters, self.PrmStatFields, context)
+        stat_index = [source.fields().lookupField(name) for name in stat_fields]
+
+        if source.sourceCrs() == epsg4326:
+            transform = None
+        else:
+            transform = QgsCoordinateTransform(source.sourceCrs(), epsg4326, context.transformContext())
+
+        # Cell key -> [count, [values, sum, min, max] per numeric field]
+        cells = {}
+        total = source.featureCount()
+        step = 90.0 / total if total > 0 else 0
+        failed = 0
+        done = 0
+        iterator = source.getFeatures()
+        while not feedback.isCanceled():
+            features = list(itertools.islice(iterator, self.ChunkSize))
+            if not features:
+                break
+            valid, lats, lons = self.chunkCoordinates(features, transform)
+            failed += len(features) - len(valid)
+            if valid:
+                keys = self.encodeChunk(lats, lons, precision)
+                for i, key in zip(valid, keys):
+                    if key is None:
+                        failed += 1
+                        continue
+                    cell = cells.get(key)
+                    if cell is None:
+                        cell = [0] + [[0, 0.0, None, None] for _ in stat_index]
+                        cells[key] = cell
+                    cell[0] += 1
+                    if stat_index:
+                        self.addValues(cell, features[i], stat_index)
+            done += len(features)
+            feedback.setProgress(int(done * step))
+        if feedback.isCanceled():
+            return {}
+
+        fields = QgsFields()
+        fields.append(QgsField('mgrs', QVariant.String))
+        fields.append(QgsField('count', QVariant.Int))
+        for name in stat_fields:
+            for stat in self.Stats:
+                fields.append(QgsField('{}_{}'.format(name, stat), QVariant.Double))
+        (sink, dest_id) = self.parameterAsSink(
+            parameters, self.PrmOutput,
+            context, fields, QgsWkbTypes.Polygon, epsg4326)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.PrmOutput))
+
+        keys = sorted(cells)
+        for start in range(0, len(keys), self.ChunkSize):
+            if feedback.isCanceled():
+                break
+            chunk = keys[start:start + self.ChunkSize]
+            features = []
+            for key, ring in zip(chunk, mgrs.cellBounds(chunk)):
+                f = QgsFeature()
+                if ring is not None:
+                    poly = QgsPolygon()
+                    poly.setExteriorRing(QgsLineString([p[0] for p in ring], [p[1] for p in ring]))
+                    f.setGeometry(QgsGeometry(poly))
+                f.setAttributes([key] + self.cellAttributes(cells[key]))
+                features.append(f)
+            sink.addFeatures(features, QgsFeatureSink.FastInsert)
+            feedback.setProgress(90 + int(10.0 * (start + len(chunk)) / len(keys)))
+
+        if failed:
+            feedback.pushInfo('{} features could not be converted to MGRS'.format(failed))
+        feedback.pushInfo('{} points aggregated into {} MGRS cells'.format(done - failed, len(keys)))
+        return {self.PrmOutput: dest_id}
+
+    def addValues(self, cell, feature, stat_index):
+        '''Add the numeric field values of a feature to the running
+        statistics of its cell. NULL and non numeric values are skipped.'''
+        attrs = feature.attributes()
+        for stat, index in zip(cell[1:], stat_index):
+            try:
+                value = float(attrs[index])
+            except (TypeError, ValueError):
+                continue
+            stat[0] += 1
+            stat[1] += value
+            if stat[2] is None or value < stat[2]:
+                stat[2] = value
+            if stat[3] is None or value > stat[3]:
+                stat[3] = value
+
+    def cellAttributes(self, cell):
+        attrs = [cell[0]]
+        for count, total, minimum, maximum in cell[1:]:
+            if count:
+                attrs.extend([total, total / count, minimum, maximum])
+            else:
+                attrs.extend([None, None, None, None])
+        return attrs
+
+    def name(self):
+        return 'mgrsaggregate'
+
+    def displayName(self):
+        return 'Aggregate points into MGRS cells'
+
+    def createInstance(self):
+        return MgrsAggregateAlgorithm()
@@ -11,7 +11,7 @@
 from qgis.PyQt.QtCore import Qt, QUrl
 from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QAction
-from qgis.core import QgsApplication
+from qgis.core import QgsApplication, QgsProject
 import processing
 
 from .provider import MGRSProvider
@@ -19,6 +19,7 @@ from .provider import MGRSProvider
 from .zoomToMgrs import ZoomToMgrs
 from .copyMgrsTool import CopyMgrsTool
 from .mgrsGeomGenerator import MgrsGeomGenerator
+from .mgrsGridLayer import MgrsGridLayer, MgrsGridLayerType
 from .settings import SettingsWidget
 import os
 import webbrowser
@@ -76,6 +77,15 @@ class MGRSCapture:
         self.gzdAction.triggered.connect(self.gzd)
         self.iface.addPluginToMenu("MGRS", self.gzdAction)
 
+        # MGRS grid overlay layer
+        self.gridLayerType = MgrsGridLayerType()
+        QgsApplication.pluginLayerRegistry().addPluginLayerType(self.gridLayerType)
+        icon = QIcon(':/images/themes/default/mActionAddLayer.svg')
+        self.gridAction = QAction(icon, "MGRS Grid Overlay", self.iface.mainWindow())
+        self.gridAction.setObjectName('mgrsGridOverlay')
+        self.gridAction.triggered.connect(self.addGridLayer)
+        self.iface.addPluginToMenu("MGRS", self.gridAction)
+
         # Initialize the Settings Dialog Box
         settingsicon = QIcon(':/images/themes/default/mActionOptions.svg')
         self.settingsAction = QAction(settingsicon, "Settings", self.iface.mainWindow())
@@ -113,6 +123,7 @@ class MGRSCapture:
         self.iface.removePluginMenu('MGRS', self.zoomToAction)
         self.iface.removePluginMenu('MGRS', self.geomGenAction)
         self.iface.removePluginMenu('MGRS', self.gzdAction)
+        self.iface.removePluginMenu('MGRS', self.gridAction)
         self.iface.removePluginMenu('MGRS', self.settingsAction)
         self.iface.removePluginMenu('MGRS', self.helpAction)
         self.iface.removeDockWidget(self.zoomToDialog)
@@ -127,6 +138,7 @@ class MGRSCapture:
         self.settingsDialog = None
         self.mapTool = None
         QgsApplication.processingRegistry().removeProvider(self.provider)
+        QgsApplication.pluginLayerRegistry().removePluginLayerType(MgrsGridLayer.LAYER_TYPE)
 
     def startCapture(self):
         '''Set the focus of the copy coordinate tool'''
@@ -143,6 +155,10 @@ class MGRSCapture:
     def gzd(self):
         processing.execAlgorithmDialog('mgrs:mgrsgzd', {})
 
+    def addGridLayer(self):
+        '''Add the MGRS grid overlay layer to the project.'''
+        QgsProject.instance().addMapLayer(MgrsGridLayer())
+
     def settings(self):
         '''Show the settings dialog box'''
         self.settingsDialog.show()
@@ -0,0 +1,159 @@
+"""
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import itertools
+
+from qgis.PyQt.QtCore import QVariant
+from qgis.core import (
+    QgsFeature,
+    QgsFeatureSink,
+    QgsField,
+    QgsGeometry,
+    QgsLineString,
+    QgsPolygon,
+    QgsProcessing,
+    QgsProcessingException,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterField,
+    QgsProcessingParameterNumber,
+    QgsWkbTypes)
+
+from .settings import epsg4326
+from .mgrsToPoint import MgrsToPointAlgorithm
+from . import mgrs
+
+
+class MgrsCellsAlgorithm(MgrsToPointAlgorithm):
+    """
+    Algorithm to convert a table with an MGRS coordinate field to the
+    polygons of the MGRS cells, whose size follows the precision of each
+    coordinate. Rows that cannot be decoded are written to an error layer.
+    """
+    PrmDensify = 'Densify'
+
+    def initAlgorithm(self, config):
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.PrmInput,
+                'Input layer or table',
+                [QgsProcessing.TypeVector])
+        )
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.PrmMgrsField,
+                'MGRS field',
+                parentLayerParameterName=self.PrmInput,
+                type=QgsProcessingParameterField.String)
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.PrmDensify,
+                'Vertices added along each cell edge',
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=0,
+                minValue=0,
+                maxValue=1000)
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.PrmOutput,
+                'Output cell polygons',
+                QgsProcessing.TypeVectorPolygon)
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.PrmErrors,
+                'Invalid MGRS coordinates',
+                QgsProcessing.TypeVector,
+                optional=True,
+                createByDefault=True)
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.PrmInput, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.PrmInput))
+        field_name = self.parameterAsString(parameters, self.PrmMgrsField, context)
+        field_index = source.fields().lookupField(field_name)
+        if field_index == -1:
+            raise QgsProcessingException('Field {} not found in the input layer'.format(field_name))
+        densify = self.parameterAsInt(parameters, self.PrmDensify, context)
+
+        fields = source.fields()
+        (sink, dest_id) = self.parameterAsSink(
+            parameters, self.PrmOutput,
+            context, fields, QgsWkbTypes.Polygon, epsg4326)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.PrmOutput))
+
+        error_fields = source.fields()
+        error_fields.append(QgsField('error', QVariant.String))
+        (error_sink, error_id) = self.parameterAsSink(
+            parameters, self.PrmErrors,
+            context, error_fields, QgsWkbTypes.NoGeometry)
+
+        total = source.featureCount()
+        step = 100.0 / total if total > 0 else 0
+        failed = 0
+        done = 0
+        iterator = source.getFeatures()
+        while not feedback.isCanceled():
+            chunk = list(itertools.islice(iterator, self.ChunkSize))
+            if not chunk:
+                break
+            values = []
+            for feature in chunk:
+                value = feature[field_index]
+                values.append(value if isinstance(value, str) else None)
+            rings = mgrs.cellBounds(values, densify)
+
+            features = []
+            errors = []
+            for feature, value, ring in zip(chunk, values, rings):
+                if ring is not None:
+                    poly = QgsPolygon()
+                    poly.setExteriorRing(QgsLineString([p[0] for p in ring], [p[1] for p in ring]))
+                    f = QgsFeature()
+                    f.setGeometry(QgsGeometry(poly))
+                    f.setAttributes(feature.attributes())
+                    features.append(f)
+                else:
+                    failed += 1
+                    if error_sink is not None:
+                        f = QgsFeature()
+                        f.setAttributes(feature.attributes() + [self.errorReason(value)])
+                        errors.append(f)
+            sink.addFeatures(features, QgsFeatureSink.FastInsert)
+            if errors:
+                error_sink.addFeatures(errors, QgsFeatureSink.FastInsert)
+            done += len(chunk)
+            feedback.setProgress(int(done * step))
+
+        if failed:
+            feedback.pushInfo('{} rows had an invalid MGRS coordinate'.format(failed))
+        results = {self.PrmOutput: dest_id}
+        if error_sink is not None:
+            results[self.PrmErrors] = error_id
+        return results
+
+    def errorReason(self, value):
+        if value is not None and mgrs.isValid(value):
+            return 'The MGRS cell lies outside of its grid zone designator'
+        return super().errorReason(value)
+
+    def name(self):
+        return 'mgrs2cells'
+
+    def displayName(self):
+        return 'MGRS strings to cell polygons'
+
+    def createInstance(self):
+        return MgrsCellsAlgorithm()
@@ -0,0 +1,204 @@
+"""
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+
+Command line bulk converter, run from the plugin directory without QGIS:
+
+    python -m mgrs to-mgrs --lat-field lat --lon-field lon points.csv > out.csv
+    python -m mgrs to-wgs --mgrs-field mgrs --format jsonl < in.jsonl
+
+The input is read as CSV, TSV or JSON Lines from a file or stdin and
+converted in chunks by a pool of worker processes. Only a few chunks per
+worker are held at a time and results are written in input order as soon
+as they are ready, so memory use stays flat on files of any size.
+"""
+import argparse
+import collections
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+
+import mgrs
+
+FORMATS = ('csv', 'tsv', 'jsonl')
+
+# Chunks queued per worker process
+CHUNKS_PER_WORKER = 2
+
+
+def _initWorker(backend):
+    if backend:
+        mgrs.init(backend)
+
+
+def convertToMgrs(task):
+    '''Return the MGRS strings of a chunk of (latitude, longitude) values,
+    None for the coordinates that cannot be converted.'''
+    values, precision = task
+    return [s.strip() if s is not None else None
+            for s in mgrs.iterToMgrs(values, precision, len(values), errors='none')]
+
+
+def convertToWgs(task):
+    '''Return the (latitude, longitude) of a chunk of MGRS strings, None for
+    the strings that cannot be decoded.'''
+    values, _ = task
+    values = [v if isinstance(v, str) else None for v in values]
+    return list(mgrs.iterToWgs(values, len(values), errors='none'))
+
+
+class JsonLinesReader():
+    def __init__(self, f):
+        self.f = f
+        self.fieldnames = []
+
+    def __iter__(self):
+        for line in self.f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class JsonLinesWriter():
+    def __init__(self, f):
+        self.f = f
+
+    def writeheader(self):
+        pass
+
+    def writerow(self, row):
+        self.f.write(json.dumps(row))
+        self.f.write('\n')
+
+
+def openReader(f, fmt):
+    if fmt == 'jsonl':
+        return JsonLinesReader(f)
+    return csv.DictReader(f, delimiter='\t' if fmt == 'tsv' else ',')
+
+
+def openWriter(f, fmt, fieldnames):
+    if fmt == 'jsonl':
+        return JsonLinesWriter(f)
+    return csv.DictWriter(f, fieldnames, delimiter='\t' if fmt == 'tsv' else ',',
+                          lineterminator='\n', extrasaction='ignore')
+
+
+def guessFormat(path):
+    ext = os.path.splitext(path or '')[1].lower().lstrip('.')
+    if ext in ('tsv', 'tab'):
+        return 'tsv'
+    if ext in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    return 'csv'
+
+
+def orderedResults(chunks, func, precision, workers, backend):
+    '''Yield (rows, results) for every chunk of rows in input order. With
+    more than one worker, chunks are converted by a process pool with at
+    most CHUNKS_PER_WORKER chunks per worker in flight.'''
+    if workers <= 1:
+        _initWorker(backend)
+        for rows, values in chunks:
+            yield rows, func((values, precision))
+        return
+    with multiprocessing.Pool(workers, _initWorker, (backend,)) as pool:
+        pending = collections.deque()
+        for rows, values in chunks:
+            pending.append((rows, pool.apply_async(func, ((values, precision),))))
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                rows, result = pending.popleft()
+                yield rows, result.get()
+        while pending:
+            rows, result = pending.popleft()
+            yield rows, result.get()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m mgrs',
+        description='Convert CSV, TSV or JSON Lines between latitude, longitude and MGRS.')
+    parser.add_argument('direction', choices=('to-mgrs', 'to-wgs'),
+                        help='to-mgrs adds an MGRS field, to-wgs adds latitude and longitude fields')
+    parser.add_argument('input', nargs='?', default='-', help='input file (default: stdin)')
+    parser.add_argument('-o', '--output', default='-', help='output file (default: stdout)')
+    parser.add_argument('--format', choices=FORMATS,
+                        help='input and output format (default: from the input extension, else csv)')
+    parser.add_argument('--lat-field', default='latitude', help='latitude field (default: latitude)')
+    parser.add_argument('--lon-field', default='longitude', help='longitude field (default: longitude)')
+    parser.add_argument('--mgrs-field', default='mgrs', help='MGRS field (default: mgrs)')
+    parser.add_argument('--precision', type=int, default=5, choices=range(0, 6),
+                        help='MGRS precision (default: 5)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: number of CPUs)')
+    parser.add_argument('--chunk-size', type=int, default=10000,
+                        help='rows converted at a time by a worker (default: 10000)')
+    parser.add_argument('--backend', choices=mgrs.BACKENDS, help='coordinate transformation backend')
+    args = parser.parse_args(argv)
+
+    fmt = args.format or guessFormat(args.input if args.input != '-' else args.output)
+    to_mgrs = args.direction == 'to-mgrs'
+    infile = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    outfile = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        reader = openReader(infile, fmt)
+        fieldnames = list(reader.fieldnames or [])
+        if to_mgrs:
+            input_fields = (args.lat_field, args.lon_field)
+            output_fields = (args.mgrs_field,)
+        else:
+            input_fields = (args.mgrs_field,)
+            output_fields = (args.lat_field, args.lon_field)
+        if fmt != 'jsonl':
+            missing = [name for name in input_fields if name not in fieldnames]
+            if missing:
+                parser.error('field(s) not found in the input: {}'.format(', '.join(missing)))
+        writer = openWriter(outfile, fmt, fieldnames + [f for f in output_fields if f not in fieldnames])
+        writer.writeheader()
+
+        def chunks():
+            rows = iter(reader)
+            while True:
+                chunk = list(itertools.islice(rows, max(args.chunk_size, 1)))
+                if not chunk:
+                    return
+                if to_mgrs:
+                    values = [(row.get(args.lat_field), row.get(args.lon_field)) for row in chunk]
+                else:
+                    values = [row.get(args.mgrs_field) for row in chunk]
+                yield chunk, values
+
+        failed = 0
+        func = convertToMgrs if to_mgrs else convertToWgs
+        for rows, results in orderedResults(chunks(), func, args.precision, args.workers, args.backend):
+            for row, result in zip(rows, results):
+                if result is None:
+                    failed += 1
+                if to_mgrs:
+                    row[args.mgrs_field] = result
+                elif result is None:
+                    row[args.lat_field] = row[args.lon_field] = None
+                else:
+                    row[args.lat_field], row[args.lon_field] = result
+                writer.writerow(row)
+            outfile.flush()
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    if failed:
+        print('{} rows could not be converted'.format(failed), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
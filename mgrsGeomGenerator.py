@@ -8,15 +8,22 @@
  *                                                                         *
  ***************************************************************************/
 """
+import csv
+import functools
+import itertools
+import math
 import os
 import re
 from geographiclib.geodesic import Geodesic
 from geographiclib.polygonarea import PolygonArea
 
 from qgis.PyQt.QtWidgets import QDialog, QDialogButtonBox
-from qgis.PyQt.QtCore import QVariant
+from qgis.PyQt.QtCore import QCoreApplication, QVariant
 from qgis.PyQt.uic import loadUiType
-from qgis.core import Qgis, QgsFeature, QgsGeometry, QgsProject, QgsPointXY, QgsVectorLayer, QgsField
+from qgis.core import (
+    Qgis, QgsApplication, QgsFeature, QgsField, QgsFields, QgsGeometry, QgsLineString, QgsMessageLog, QgsProject,
+    QgsPointXY, QgsTask, QgsVectorFileWriter, QgsVectorLayer, QgsWkbTypes)
+from qgis.gui import QgsFileWidget
 
 from . import mgrs
 from .settings import epsg4326
@@ -25,137 +32,381 @@ import traceback
 FORM_CLASS, _ = loadUiType(os.path.join(
     os.path.dirname(__file__), 'ui/mgrsGeomGen.ui'))
 
+# Separators between the MGRS coordinates of the text box and text files
+SEPARATORS = re.compile(r'[\s,;:]+')
+
+@functools.lru_cache(maxsize=4096)
+def geodesicLine(lat1, lon1, lat2, lon2):
+    '''Return the WGS 84 geodesic line between two points. Lines are cached
+    so routes built again, or segments repeated within a route, are solved
+    once.'''
+    return Geodesic.WGS84.InverseLine(lat1, lon1, lat2, lon2)
+
 class MgrsGeomGenerator(QDialog, FORM_CLASS):
     def __init__(self, iface, parent):
         super(MgrsGeomGenerator, self).__init__(parent)
         self.setupUi(self)
         self.iface = iface
         self.canvas = iface.mapCanvas()
+        self.task = None
+        self.progressBar.hide()
+        self.inputFileWidget.setFilter('Text and CSV files (*.txt *.csv *.tsv);;All files (*)')
+        self.outputFileWidget.setStorageMode(QgsFileWidget.SaveFile)
+        self.outputFileWidget.setFilter('GeoPackage (*.gpkg)')
+        self.modeComboBox.currentIndexChanged.connect(self.modeChanged)
+        self.modeChanged(self.modeComboBox.currentIndex())
         # self.buttonBox.button(QDialogButtonBox.Reset).setText("Clear")
 
     def accept(self):
-        geod = Geodesic.WGS84
-        mode = self.modeComboBox.currentIndex()
-        pts = []
-        mgs = []
-        try:
+        '''Decode the coordinates and build the layer in a background task
+        so the dialog and QGIS stay responsive.'''
+        if self.task is not None:
+            return
+        path = self.inputFileWidget.filePath().strip()
+        valuestr = None
+        if path:
+            if not os.path.isfile(path):
+                self.iface.messageBar().pushMessage("", "The MGRS input file does not exist", level=Qgis.Warning, duration=4)
+                return
+        else:
             valuestr = str(self.valuesTextEdit.toPlainText()).strip()
-            values = re.split(r'[\s,;:]+', valuestr)
-            if len(values) == 0:
+            if not valuestr:
                 self.iface.messageBar().pushMessage("", "Enter MGRS coordinates", level=Qgis.Warning, duration=4)
                 return
-            for mg in values:
-                lat, lon = mgrs.toWgs(mg)
-                pt = QgsPointXY(lon, lat)
-                pts.append(pt)
-                mgs.append(mg)
+        output = self.outputFileWidget.filePath().strip()
+        if output and not output.lower().endswith('.gpkg'):
+            output += '.gpkg'
+        self.task = MgrsGeomTask(
+            self.iface, self.modeComboBox.currentIndex(), text=valuestr, path=path, output=output,
+            densify=self.densifySpinBox.value() * 1000.0, segments=self.segmentsCheckBox.isChecked())
+        self.task.progressChanged.connect(self.taskProgress)
+        self.task.taskCompleted.connect(self.taskDone)
+        self.task.taskTerminated.connect(self.taskDone)
+        self.buttonBox.button(QDialogButtonBox.Ok).setEnabled(False)
+        self.progressBar.setValue(0)
+        self.progressBar.show()
+        QgsApplication.taskManager().addTask(self.task)
+
+    def modeChanged(self, mode):
+        # The densification and segment options only apply to lines
+        self.densifySpinBox.setEnabled(mode == 1)
+        self.segmentsCheckBox.setEnabled(mode == 1)
+
+    def taskProgress(self, progress):
+        self.progressBar.setValue(int(progress))
+
+    def taskDone(self):
+        self.task = None
+        self.progressBar.hide()
+        self.buttonBox.button(QDialogButtonBox.Ok).setEnabled(True)
+
+
+class GeomTaskError(Exception):
+    '''Stops MgrsGeomTask. The message is shown in the message bar, or
+    is None when the task was canceled.'''
+    pass
+
+
+class MgrsGeomTask(QgsTask):
+    '''Task decoding MGRS coordinates and building the points, line,
+    polygon or bounding box layer. The coordinates come from the text box or
+    are streamed from a text or CSV file, and the layer is either a memory
+    layer, created in the task thread and added to the project in
+    finished(), or a GeoPackage written as the coordinates are decoded.'''
+    # Number of coordinates decoded and features added at a time
+    CHUNK_SIZE = 10000
+    WKB_TYPES = {
+        'Point': QgsWkbTypes.Point,
+        'LineString': QgsWkbTypes.LineString,
+        'Polygon': QgsWkbTypes.Polygon}
+
+    def __init__(self, iface, mode, text=None, path=None, output=None, densify=0, segments=False):
+        super(MgrsGeomTask, self).__init__('MGRS Geometry Generator', QgsTask.CanCancel)
+        self.iface = iface
+        self.mode = mode
+        self.text = text
+        self.path = path or None
+        self.output = output or None
+        self.densify = densify
+        self.segments = segments
+        self.name = None
+        self.layer = None
+        self.writer = None
+        self.fraction = 0.0
+        self.error = None
+
+    def run(self):
+        try:
+            chunks = self.decodedChunks()
+            if self.mode == 0:  # Points
+                self.pointLayer(chunks)
+            elif self.mode == 1:  # Line
+                self.lineLayer(chunks)
+            elif self.mode == 2:  # Polygon
+                self.polygonLayer(chunks)
+            else:  # Minimum bounding box
+                self.boundingBoxLayer(chunks)
+            if self.writer is not None:
+                # Deleting the writer closes the GeoPackage
+                self.writer = None
+            else:
+                # The layer must belong to the main thread to be added to the project
+                self.layer.moveToThread(QCoreApplication.instance().thread())
+            return True
+        except GeomTaskError as e:
+            self.error = e.args[0]
         except Exception:
-            self.iface.messageBar().pushMessage("", "One or more entered mgrs coordinates were invalid", level=Qgis.Warning, duration=4)
-            s = traceback.format_exc()
-            print(s)
+            self.error = "The MGRS geometry could not be created"
+            QgsMessageLog.logMessage(traceback.format_exc(), 'MGRS', level=Qgis.Critical)
+        self.discardOutput()
+        return False
+
+    def finished(self, result):
+        if result:
+            if self.output:
+                layer = QgsVectorLayer(self.output, self.name, 'ogr')
+                if layer.isValid():
+                    QgsProject.instance().addMapLayer(layer)
+            elif self.layer is not None:
+                QgsProject.instance().addMapLayer(self.layer)
+        elif self.error is not None:
+            self.iface.messageBar().pushMessage("", self.error, level=Qgis.Warning, duration=4)
+        self.layer = None
+
+    def createOutput(self, geometry, name, attr):
+        '''Create the output layer with the fields attr and return the
+        function adding a list of features to it.'''
+        self.name = name
+        if self.output:
+            fields = QgsFields()
+            for field in attr:
+                fields.append(field)
+            writer = QgsVectorFileWriter(self.output, 'UTF-8', fields, self.WKB_TYPES[geometry], epsg4326, 'GPKG')
+            if writer.hasError() != QgsVectorFileWriter.NoError:
+                raise GeomTaskError("Unable to create {}: {}".format(self.output, writer.errorMessage()))
+            self.writer = writer
+            return writer.addFeatures
+        self.layer = QgsVectorLayer("{}?crs={}".format(geometry, epsg4326.authid()), name, "memory")
+        dp = self.layer.dataProvider()
+        dp.addAttributes(attr)
+        self.layer.updateFields()
+        return dp.addFeatures
+
+    def discardOutput(self):
+        '''Remove the partly written GeoPackage of a failed or canceled task.'''
+        self.layer = None
+        if self.writer is not None:
+            self.writer = None
+            try:
+                os.remove(self.output)
+            except OSError:
+                pass
+
+    def values(self):
+        '''Yield the MGRS values of the text box or of the input file, which
+        is read a line at a time. self.fraction is updated with the part of
+        the input read so far.'''
+        if self.path is None:
+            values = [v for v in SEPARATORS.split(self.text) if v]
+            self.text = None
+            total = len(values)
+            for i, value in enumerate(values):
+                if i % self.CHUNK_SIZE == 0:
+                    self.fraction = float(i) / total
+                yield value
             return
-        
-        if mode == 0:  # Points
-            layer = QgsVectorLayer("Point?crs={}".format(epsg4326.authid()), "MGRS Points", "memory")
-            dp = layer.dataProvider()
-            attr = [QgsField('mgrs', QVariant.String),
-                QgsField('longitude', QVariant.Double),
-                QgsField('latitude', QVariant.Double)]
-            dp.addAttributes(attr)
-            layer.updateFields()
-            for i, pt in enumerate(pts):
+        size = max(os.path.getsize(self.path), 1)
+        with open(self.path, newline='', encoding='utf-8-sig', errors='replace') as f:
+            ext = os.path.splitext(self.path)[1].lower()
+            if ext in ('.csv', '.tsv'):
+                lines = self.csvValues(csv.reader(f, delimiter='\t' if ext == '.tsv' else ','))
+            else:
+                lines = (SEPARATORS.split(line) for line in f)
+            for i, line in enumerate(lines):
+                if i % 1000 == 0:
+                    self.fraction = float(f.buffer.tell()) / size
+                for value in line:
+                    if value:
+                        yield value
+
+    def csvValues(self, reader):
+        '''Yield the MGRS value of each CSV row as a one item list. The
+        values are read from the column named mgrs, or from the first column
+        when the header has no such column or there is no header.'''
+        column = 0
+        for row in reader:
+            names = [name.strip().lower() for name in row]
+            if 'mgrs' in names:
+                column = names.index('mgrs')
+            elif row and mgrs.isValid(row[0]):
+                yield row[:1]
+            break
+        for row in reader:
+            if len(row) > column:
+                yield [row[column].strip()]
+
+    def decodedChunks(self):
+        '''Yield the MGRS values in lists of up to CHUNK_SIZE with their
+        decoded latitude and longitude arrays.'''
+        count = 0
+        values = self.values()
+        while True:
+            chunk = list(itertools.islice(values, self.CHUNK_SIZE))
+            if not chunk:
+                break
+            if self.isCanceled():
+                raise GeomTaskError(None)
+            lats, lons, valid = mgrs.toWgsBatch(chunk)
+            if not valid.all():
+                raise GeomTaskError("Invalid MGRS coordinate: {}".format(chunk[int(valid.argmin())]))
+            count += len(chunk)
+            yield chunk, lats, lons
+            self.setProgress(100.0 * self.fraction)
+        if count == 0:
+            raise GeomTaskError("No MGRS coordinates were found")
+
+    def decodedPoints(self, chunks):
+        '''Return the QgsPointXY of all the coordinates with the first and
+        last MGRS values.'''
+        pts = []
+        first = last = None
+        for chunk, lats, lons in chunks:
+            if first is None:
+                first = chunk[0]
+            last = chunk[-1]
+            pts.extend([QgsPointXY(lon, lat) for lat, lon in zip(lats.tolist(), lons.tolist())])
+        return pts, first, last
+
+    def pointLayer(self, chunks):
+        attr = [QgsField('mgrs', QVariant.String),
+            QgsField('longitude', QVariant.Double),
+            QgsField('latitude', QVariant.Double)]
+        addFeatures = self.createOutput("Point", "MGRS Points", attr)
+        for chunk, lats, lons in chunks:
+            features = []
+            for mg, lat, lon in zip(chunk, lats.tolist(), lons.tolist()):
                 f = QgsFeature()
-                f.setGeometry(QgsGeometry.fromPointXY(pt))
-                f.setAttributes([mgs[i], pt.x(), pt.y()])
-                dp.addFeatures([f])
-        elif mode == 1:  # Line
-            if len(pts) < 2:
-                self.iface.messageBar().pushMessage("", "There must be 2 or more coodinates for a line", level=Qgis.Warning, duration=4)
-                return
-            # Calculate the line distance in meters
-            pt1 = pts[0]
-            distance = 0
-            for i in range(1, len(pts)):
-                pt2 = pts[i]
-                l = geod.Inverse(pt1.y(), pt1.x(), pt2.y(), pt2.x())
-                distance += l['s12']
-            layer = QgsVectorLayer("LineString?crs={}".format(epsg4326.authid()), "MGRS Line", "memory")
-            dp = layer.dataProvider()
+                f.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(lon, lat)))
+                f.setAttributes([mg, lon, lat])
+                features.append(f)
+            addFeatures(features)
+
+    def lineLayer(self, chunks):
+        '''Build the line, or one line per segment, following the geodesics
+        between the coordinates. Each geodesic is densified with a vertex
+        every self.densify meters when it is set.'''
+        lats = []
+        lons = []
+        mgs = []
+        for chunk, clats, clons in chunks:
+            lats.extend(clats.tolist())
+            lons.extend(clons.tolist())
+            if self.segments:
+                mgs.extend(chunk)
+        if len(lats) < 2:
+            raise GeomTaskError("There must be 2 or more coodinates for a line")
+        if self.segments:
+            attr = [QgsField('segment', QVariant.Int),
+                QgsField('from_mgrs', QVariant.String),
+                QgsField('to_mgrs', QVariant.String),
+                QgsField('distance', QVariant.Double),
+                QgsField('azimuth', QVariant.Double),
+                QgsField('cumulative', QVariant.Double)]
+        else:
             attr = [QgsField('distance', QVariant.Double)]
-            dp.addAttributes(attr)
-            layer.updateFields()
+        addFeatures = self.createOutput("LineString", "MGRS Line", attr)
+
+        # Distances are in meters and azimuths in degrees clockwise from north
+        xs = [lons[0]]
+        ys = [lats[0]]
+        features = []
+        distance = 0.0
+        count = len(lats) - 1
+        for i in range(count):
+            if i % 1000 == 0:
+                if self.isCanceled():
+                    raise GeomTaskError(None)
+                self.setProgress(100.0 * i / count)
+            line = geodesicLine(lats[i], lons[i], lats[i + 1], lons[i + 1])
+            if self.segments:
+                xs = [lons[i]]
+                ys = [lats[i]]
+            if self.densify > 0 and line.s13 > self.densify:
+                n = int(math.ceil(line.s13 / self.densify))
+                for k in range(1, n):
+                    pos = line.Position(line.s13 * k / n, Geodesic.LATITUDE | Geodesic.LONGITUDE)
+                    xs.append(pos['lon2'])
+                    ys.append(pos['lat2'])
+            xs.append(lons[i + 1])
+            ys.append(lats[i + 1])
+            distance += line.s13
+            if self.segments:
+                f = QgsFeature()
+                f.setGeometry(QgsGeometry(QgsLineString(xs, ys)))
+                f.setAttributes([i + 1, mgs[i], mgs[i + 1], line.s13, line.azi1 % 360.0, distance])
+                features.append(f)
+        if not self.segments:
             f = QgsFeature()
-            f.setGeometry(QgsGeometry.fromPolylineXY(pts))
+            f.setGeometry(QgsGeometry(QgsLineString(xs, ys)))
             f.setAttributes([distance])
-            dp.addFeatures([f])
-        elif mode == 2:  # Polygon
-            if len(pts) < 2:
-                self.iface.messageBar().pushMessage("", "There must be 2 or more coodinates for a polygon", level=Qgis.Warning, duration=4)
-                return
-            # Check to see if the polygon is closed. If it isn't close it.
-            if mgs[0] != mgs[len(mgs)-1]:
-                mgs.append(mgs[0])
-                pts.append(pts[0])
-                
-            poly = PolygonArea(geod)
-            for i in range(len(pts)):
-                poly.AddPoint(pts[i].y(), pts[i].x())
-            s = poly.Compute()
-            layer = QgsVectorLayer("Polygon?crs={}".format(epsg4326.authid()), "MGRS Polygon", "memory")
-            dp = layer.dataProvider()
-            attr = [QgsField('perimeter', QVariant.Double),
-                QgsField('area', QVariant.Double),
-                QgsField('valid_geom', QVariant.Bool)]
-            dp.addAttributes(attr)
-            layer.updateFields()
-            f = QgsFeature()
-            geom = QgsGeometry.fromPolygonXY([pts])
-            valid = geom.isGeosValid()
-            f.setGeometry(geom)
-            f.setAttributes([s[1],abs(s[2]), valid])
-            dp.addFeatures([f])
-        else:  # Minimum bounding box
-            if len(pts) < 2:
-                self.iface.messageBar().pushMessage("", "There must be 2 or more coodinates for a minimum bounding box", level=Qgis.Warning, duration=4)
-                return
-            layer = QgsVectorLayer("Polygon?crs={}".format(epsg4326.authid()), "MGRS Bounding Box", "memory")
-            dp = layer.dataProvider()
-            attr = [QgsField('min_lon', QVariant.Double),
-                QgsField('min_lat', QVariant.Double),
-                QgsField('max_lon', QVariant.Double),
-                QgsField('max_lat', QVariant.Double),
-                QgsField('perimeter', QVariant.Double),
-                QgsField('area', QVariant.Double)]
-            dp.addAttributes(attr)
-            layer.updateFields()
-            minx = miny = 9999
-            maxx = maxy = -9999
-            for pt in pts:
-                x = pt.x()
-                y = pt.y()
-                if x < minx:
-                    minx = x
-                if x > maxx:
-                    maxx = x
-                if y < miny:
-                    miny = y
-                if y > maxy:
-                    maxy = y
-            bbox = [
-                QgsPointXY(minx, miny),
-                QgsPointXY(minx, maxy),
-                QgsPointXY(maxx, maxy),
-                QgsPointXY(maxx, miny),
-                QgsPointXY(minx, miny)
-            ]
-            poly = PolygonArea(geod)
-            for i in range(len(bbox)):
-                poly.AddPoint(bbox[i].y(), bbox[i].x())
-            s = poly.Compute(reverse=True)
-            f = QgsFeature()
-            f.setAttributes([minx, miny, maxx, maxy, s[1], s[2]])
-            f.setGeometry(QgsGeometry.fromPolygonXY([bbox]))
-            dp.addFeatures([f])
+            features.append(f)
+        addFeatures(features)
+
+    def polygonLayer(self, chunks):
+        pts, first, last = self.decodedPoints(chunks)
+        if len(pts) < 2:
+            raise GeomTaskError("There must be 2 or more coodinates for a polygon")
+        # Check to see if the polygon is closed. If it isn't close it.
+        if first != last:
+            pts.append(pts[0])
 
+        poly = PolygonArea(Geodesic.WGS84)
+        for i in range(len(pts)):
+            poly.AddPoint(pts[i].y(), pts[i].x())
+        s = poly.Compute()
+        attr = [QgsField('perimeter', QVariant.Double),
+            QgsField('area', QVariant.Double),
+            QgsField('valid_geom', QVariant.Bool)]
+        addFeatures = self.createOutput("Polygon", "MGRS Polygon", attr)
+        f = QgsFeature()
+        geom = QgsGeometry.fromPolygonXY([pts])
+        valid = geom.isGeosValid()
+        f.setGeometry(geom)
+        f.setAttributes([s[1],abs(s[2]), valid])
+        addFeatures([f])
 
-        QgsProject.instance().addMapLayer(layer)
+    def boundingBoxLayer(self, chunks):
+        # Only the running extent is kept so any number of points fits
+        count = 0
+        minx = miny = float('inf')
+        maxx = maxy = float('-inf')
+        for chunk, lats, lons in chunks:
+            count += len(chunk)
+            minx = min(minx, float(lons.min()))
+            maxx = max(maxx, float(lons.max()))
+            miny = min(miny, float(lats.min()))
+            maxy = max(maxy, float(lats.max()))
+        if count < 2:
+            raise GeomTaskError("There must be 2 or more coodinates for a minimum bounding box")
+        attr = [QgsField('min_lon', QVariant.Double),
+            QgsField('min_lat', QVariant.Double),
+            QgsField('max_lon', QVariant.Double),
+            QgsField('max_lat', QVariant.Double),
+            QgsField('perimeter', QVariant.Double),
+            QgsField('area', QVariant.Double)]
+        addFeatures = self.createOutput("Polygon", "MGRS Bounding Box", attr)
+        bbox = [
+            QgsPointXY(minx, miny),
+            QgsPointXY(minx, maxy),
+            QgsPointXY(maxx, maxy),
+            QgsPointXY(maxx, miny),
+            QgsPointXY(minx, miny)
+        ]
+        poly = PolygonArea(Geodesic.WGS84)
+        for i in range(len(bbox)):
+            poly.AddPoint(bbox[i].y(), bbox[i].x())
+        s = poly.Compute(reverse=True)
+        f = QgsFeature()
+        f.setAttributes([minx, miny, maxx, maxy, s[1], s[2]])
+        f.setGeometry(QgsGeometry.fromPolygonXY([bbox]))
+        addFeatures([f])
@@ -0,0 +1,119 @@
+"""
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import functools
+import math
+import numpy as np
+
+from . import mgrs
+
+bands = ['C','D','E','F','G','H','J','K','L','M','N','P','Q','R','S','T','U','V','W','X']
+
+
+@functools.lru_cache(maxsize=None)
+def gzdRectangles(polar=True):
+    '''Return the MGRS grid zone designators as a tuple of
+    (gzd, zone, band, xmin, ymin, xmax, ymax) tuples in degrees. The polar
+    zones A, B, Y and Z have zone 0. The rectangles are only computed on the
+    first call.'''
+    gzds = []
+    if polar:
+        gzds.append(('A', 0, 'A', -180, -90, 0, -80))
+        gzds.append(('B', 0, 'B', 0, -90, 180, -80))
+    lat = -80
+    for b in bands:
+        height = 12 if b == 'X' else 8
+        lon = -180
+        for i in range(1, 61):
+            if b == 'X' and i in (32, 34, 36):
+                continue
+            if b == 'X' and i in (31, 37):
+                width = 9
+            elif b == 'X' and i in (33, 35):
+                width = 12
+            elif b == 'V' and i == 31:
+                width = 3
+            elif b == 'V' and i == 32:
+                width = 9
+            else:
+                width = 6
+            gzds.append(('{:02d}{}'.format(i, b), i, b, lon, lat, lon + width, lat + height))
+            lon += width
+        lat += height
+    if polar:
+        gzds.append(('Y', 0, 'Y', -180, 84, 0, 90))
+        gzds.append(('Z', 0, 'Z', 0, 84, 180, 90))
+    return tuple(gzds)
+
+
+def gridRange(zone, hemisphere, xmin, ymin, xmax, ymax, size):
+    '''Return the eastings and northings (e0, e1, n0, n1) of the grid lines
+    at a spacing of size meters that enclose the longitude, latitude
+    rectangle in the given UTM zone.'''
+    samples = 16
+    lons = np.linspace(xmin, xmax, samples)
+    central_meridian = zone * 6 - 183
+    if xmin < central_meridian < xmax:
+        # Parallels bend away from the equator, so a parallel's northing is
+        # at its extreme on the central meridian
+        lons = np.append(lons, central_meridian)
+    lats = np.linspace(ymin, ymax, samples)
+    lon = np.concatenate((lons, lons, np.full(samples, xmin), np.full(samples, xmax)))
+    lat = np.concatenate((np.full(len(lons), ymin), np.full(len(lons), ymax), lats, lats))
+    e, n = mgrs.wgsToUtm(zone, hemisphere, lat, lon)
+    e0 = math.floor((e.min() - 1) / size) * size
+    e1 = math.ceil((e.max() + 1) / size) * size
+    n0 = math.floor((n.min() - 1) / size) * size
+    n1 = math.ceil((n.max() + 1) / size) * size
+    return e0, e1, n0, n1
+
+
+def gridSquares(zone, hemisphere, xmin, ymin, xmax, ymax, size, densify=10):
+    '''Return the squares of the UTM grid at a spacing of size meters that
+    cover the longitude, latitude rectangle. The squares are returned as
+    arrays of their south west eastings and northings, and of the
+    longitudes and latitudes of their rings with densify segments per edge.
+    All the rings are transformed to EPSG:4326 with a single call.'''
+    e0, e1, n0, n1 = gridRange(zone, hemisphere, xmin, ymin, xmax, ymax, size)
+    eastings, northings = np.meshgrid(np.arange(e0, e1, size), np.arange(n0, n1, size))
+    eastings = eastings.ravel()
+    northings = northings.ravel()
+
+    densify = max(int(densify), 1)
+    t = np.linspace(0.0, 1.0, densify + 1)[:-1]
+    ox = np.concatenate((t, np.ones(densify), 1.0 - t, np.zeros(densify), [0.0]))
+    oy = np.concatenate((np.zeros(densify), t, np.ones(densify), 1.0 - t, [0.0]))
+    x = eastings[:, None] + ox * size
+    y = northings[:, None] + oy * size
+    lat, lon = mgrs.utmToWgs(zone, hemisphere, x.ravel(), y.ravel())
+    # Keep rings crossing the antimeridian continuous around the zone
+    central_meridian = zone * 6 - 183
+    lon = central_meridian + (lon - central_meridian + 180.0) % 360.0 - 180.0
+    return eastings, northings, lon.reshape(x.shape), lat.reshape(y.shape)
+
+
+def gridLines(zone, hemisphere, e0, e1, n0, n1, spacing, segments):
+    '''Return the lines of the UTM grid at a spacing of spacing meters
+    between eastings e0 to e1 and northings n0 to n1, as arrays of the
+    longitudes and latitudes of each line with segments segments. All the
+    lines are transformed to EPSG:4326 with a single call.'''
+    eastings = np.arange(e0, e1 + spacing / 2.0, spacing)
+    northings = np.arange(n0, n1 + spacing / 2.0, spacing)
+    t = np.linspace(0.0, 1.0, max(int(segments), 1) + 1)
+    x = np.concatenate((
+        np.repeat(eastings[:, None], len(t), axis=1),
+        np.tile(e0 + t * (e1 - e0), (len(northings), 1))))
+    y = np.concatenate((
+        np.tile(n0 + t * (n1 - n0), (len(eastings), 1)),
+        np.repeat(northings[:, None], len(t), axis=1)))
+    lat, lon = mgrs.utmToWgs(zone, hemisphere, x.ravel(), y.ravel())
+    central_meridian = zone * 6 - 183
+    lon = central_meridian + (lon - central_meridian + 180.0) % 360.0 - 180.0
+    return lon.reshape(x.shape), lat.reshape(y.shape)
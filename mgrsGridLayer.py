@@ -0,0 +1,269 @@
+"""
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from qgis.PyQt.QtCore import Qt, QPointF
+from qgis.PyQt.QtGui import QColor, QFont, QPen
+from qgis.core import (
+    QgsCsException,
+    QgsFeedback,
+    QgsGeometry,
+    QgsLineString,
+    QgsMapLayerRenderer,
+    QgsMultiLineString,
+    QgsPluginLayer,
+    QgsPluginLayerType,
+    QgsPointXY,
+    QgsRectangle)
+
+from .settings import settings, epsg4326
+from .mgrsGrid import gzdRectangles, gridRange, gridLines
+from . import mgrs
+
+# Grid levels drawn by the overlay: the grid spacing in meters (0 for the
+# grid zone designators only) and the largest map scale denominator at which
+# the level is used
+GRID_LEVELS = [
+    (1000, 50000),
+    (10000, 500000),
+    (100000, 5000000),
+    (0, None)]
+
+# Number of segments of the grid lines along 100 km
+SEGMENTS_PER_100KM = 20
+
+
+class GridTileCache():
+    '''Thread safe least recently used cache of grid tiles. A tile holds the
+    grid lines, as a QgsGeometry in EPSG:4326, and the labels of either the
+    grid zone designators, a grid zone designator at the 100 km level or a
+    100 km square at the finer levels.'''
+    def __init__(self, size=512):
+        self.size = size
+        self.tiles = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, factory):
+        with self.lock:
+            tile = self.tiles.get(key)
+            if tile is not None:
+                self.tiles.move_to_end(key)
+                return tile
+        # Tiles are built outside of the lock so other renderers are not
+        # held up; two threads may build the same tile but both are equal
+        tile = factory()
+        with self.lock:
+            self.tiles[key] = tile
+            while len(self.tiles) > self.size:
+                self.tiles.popitem(last=False)
+        return tile
+
+    def clear(self):
+        with self.lock:
+            self.tiles.clear()
+
+
+tileCache = GridTileCache()
+
+
+def gzdTile():
+    '''Return the tile of the grid zone designator outlines and labels.'''
+    lines = QgsMultiLineString()
+    labels = []
+    for gzd, zone, band, xmin, ymin, xmax, ymax in gzdRectangles(True):
+        # Densify the outlines so they follow the parallels and meridians
+        # in any map projection
+        xs = np.linspace(xmin, xmax, int(xmax - xmin) + 1)
+        ys = np.linspace(ymin, ymax, int(ymax - ymin) + 1)
+        x = np.concatenate((xs, np.full(len(ys), xmax), xs[::-1], np.full(len(ys), xmin)))
+        y = np.concatenate((np.full(len(xs), ymin), ys, np.full(len(xs), ymax), ys[::-1]))
+        lines.addGeometry(QgsLineString(x.tolist(), y.tolist()))
+        labels.append((gzd, (xmin + xmax) / 2.0, (ymin + ymax) / 2.0))
+    return QgsGeometry(lines), labels
+
+
+def squaresTile(gzd, zone, rect):
+    '''Return the tile of the 100 km grid of a grid zone designator.'''
+    hemisphere = 'N' if rect.yMinimum() >= 0 else 'S'
+    e0, e1, n0, n1 = gridRange(zone, hemisphere, rect.xMinimum(), rect.yMinimum(),
+                               rect.xMaximum(), rect.yMaximum(), 100000)
+    segments = int((max(e1 - e0, n1 - n0) / 100000.0) * SEGMENTS_PER_100KM)
+    lines = clippedLines(zone, hemisphere, e0, e1, n0, n1, 100000, segments, rect)
+
+    # Label the squares whose center lies within the grid zone designator
+    eastings, northings = np.meshgrid(np.arange(e0, e1, 100000.0) + 50000.0,
+                                      np.arange(n0, n1, 100000.0) + 50000.0)
+    lat, lon = mgrs.utmToWgs(zone, hemisphere, eastings.ravel(), northings.ravel())
+    inside = (lon > rect.xMinimum()) & (lon < rect.xMaximum()) & \
+        (lat > rect.yMinimum()) & (lat < rect.yMaximum())
+    labels = []
+    if np.any(inside):
+        ids = mgrs.toMgrsBatch(lat[inside], lon[inside], 0)
+        labels = [(id[3:], x, y) for id, x, y in zip(ids, lon[inside].tolist(), lat[inside].tolist())]
+    return lines, labels
+
+
+def squareGridTile(gzd, zone, rect, spacing, easting, northing):
+    '''Return the tile of the grid at spacing meters within one 100 km
+    square, clipped to its grid zone designator.'''
+    hemisphere = 'N' if rect.yMinimum() >= 0 else 'S'
+    lines = clippedLines(zone, hemisphere, easting, easting + 100000, northing,
+                         northing + 100000, spacing, SEGMENTS_PER_100KM, rect)
+    lat, lon = mgrs.utmToWgs(zone, hemisphere, easting + 50000.0, northing + 50000.0)
+    labels = []
+    if rect.contains(QgsPointXY(lon, lat)):
+        square_id = mgrs.toMgrs(lat, lon, 0)
+        labels.append(('{} {}'.format(square_id[:3], square_id[3:]), lon, lat))
+    return lines, labels
+
+
+def clippedLines(zone, hemisphere, e0, e1, n0, n1, spacing, segments, rect):
+    '''Return the UTM grid lines as a QgsGeometry clipped to rect.'''
+    lons, lats = gridLines(zone, hemisphere, e0, e1, n0, n1, spacing, segments)
+    lines = QgsMultiLineString()
+    for x, y in zip(lons, lats):
+        lines.addGeometry(QgsLineString(x.tolist(), y.tolist()))
+    return QgsGeometry(lines).intersection(QgsGeometry.fromRect(rect))
+
+
+class MgrsGridLayer(QgsPluginLayer):
+    '''Map layer drawing a live MGRS grid whose level of detail, from the
+    grid zone designators down to a 1 km grid, follows the map scale.'''
+    LAYER_TYPE = 'mgrsgrid'
+
+    def __init__(self, name='MGRS Grid'):
+        super().__init__(MgrsGridLayer.LAYER_TYPE, name)
+        self.setCrs(epsg4326)
+        self.setValid(True)
+
+    def createMapRenderer(self, context):
+        return MgrsGridRenderer(self, context)
+
+    def extent(self):
+        return QgsRectangle(-180, -90, 180, 90)
+
+    def setTransformContext(self, context):
+        pass
+
+    def clone(self):
+        return MgrsGridLayer(self.name())
+
+    def readXml(self, node, context):
+        return True
+
+    def writeXml(self, node, doc, context):
+        return True
+
+
+class MgrsGridLayerType(QgsPluginLayerType):
+    def __init__(self):
+        super().__init__(MgrsGridLayer.LAYER_TYPE)
+
+    def createLayer(self, uri=None):
+        return MgrsGridLayer()
+
+    def showLayerProperties(self, layer):
+        return False
+
+
+class MgrsGridRenderer(QgsMapLayerRenderer):
+    '''Renders the grid in the map rendering worker thread. The grid
+    geometry of the visible tiles comes from tileCache and is only built
+    for tiles not rendered before.'''
+    def __init__(self, layer, context):
+        super().__init__(layer.id(), context)
+        self.line_color = QColor(settings.lineColor)
+        self.font_color = QColor(settings.fontColor)
+        self._feedback = QgsFeedback()
+
+    def feedback(self):
+        return self._feedback
+
+    def canceled(self):
+        return self._feedback.isCanceled() or self.renderContext().renderingStopped()
+
+    def render(self):
+        context = self.renderContext()
+        extent = context.extent().intersect(QgsRectangle(-180, -90, 180, 90))
+        if extent.isEmpty():
+            return True
+        scale = context.rendererScale()
+        spacing = [s for s, max_scale in GRID_LEVELS if max_scale is None or scale < max_scale][0]
+
+        tiles = [tileCache.get('gzd', gzdTile)]
+        gzds = [g for g in gzdRectangles(False) if extent.intersects(QgsRectangle(*g[3:]))]
+        for gzd, zone, band, xmin, ymin, xmax, ymax in gzds:
+            if self.canceled() or spacing == 0:
+                break
+            rect = QgsRectangle(xmin, ymin, xmax, ymax)
+            if spacing == 100000:
+                tiles.append(tileCache.get((spacing, gzd), lambda: squaresTile(gzd, zone, rect)))
+                continue
+            # Finer grids are cached per 100 km square
+            visible = extent.intersect(rect)
+            hemisphere = 'N' if ymin >= 0 else 'S'
+            e0, e1, n0, n1 = gridRange(zone, hemisphere, visible.xMinimum(), visible.yMinimum(),
+                                       visible.xMaximum(), visible.yMaximum(), 100000)
+            for e in range(int(e0), int(e1), 100000):
+                for n in range(int(n0), int(n1), 100000):
+                    if self.canceled():
+                        return True
+                    tiles.append(tileCache.get(
+                        (spacing, gzd, e, n),
+                        lambda e=e, n=n: squareGridTile(gzd, zone, rect, spacing, e, n)))
+
+        painter = context.painter()
+        painter.save()
+        try:
+            self.drawTiles(context, painter, tiles)
+        finally:
+            painter.restore()
+        return True
+
+    def drawTiles(self, context, painter, tiles):
+        transform = context.coordinateTransform()
+        m2p = context.mapToPixel()
+        pixels = m2p.transform()
+        pen = QPen(self.line_color)
+        pen.setWidthF(0.26 * context.scaleFactor())
+        painter.setPen(pen)
+        painter.setBrush(Qt.NoBrush)
+        for i, (lines, labels) in enumerate(tiles):
+            if self.canceled():
+                return
+            if i == 1:
+                # Grid lines are drawn thinner than the zone outlines
+                pen.setWidthF(0.18 * context.scaleFactor())
+                painter.setPen(pen)
+            geom = QgsGeometry(lines)
+            try:
+                if transform.isValid():
+                    geom.transform(transform)
+            except QgsCsException:
+                continue
+            geom.transform(pixels)
+            geom.constGet().draw(painter)
+
+        font = QFont()
+        font.setPixelSize(max(int(8 * 0.3528 * context.scaleFactor()), 1))
+        painter.setFont(font)
+        painter.setPen(QPen(self.font_color))
+        for lines, labels in tiles:
+            for text, x, y in labels:
+                try:
+                    pt = transform.transform(x, y) if transform.isValid() else QgsPointXY(x, y)
+                except QgsCsException:
+                    continue
+                pt = m2p.transform(pt)
+                painter.drawText(QPointF(pt.x(), pt.y()), text)
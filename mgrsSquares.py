@@ -0,0 +1,168 @@
+"""
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import os
+
+from qgis.PyQt.QtCore import QVariant, QUrl
+from qgis.core import (
+    QgsFeature,
+    QgsFeatureSink,
+    QgsField,
+    QgsFields,
+    QgsGeometry,
+    QgsLineString,
+    QgsPolygon,
+    QgsRectangle,
+    QgsWkbTypes,
+    QgsProcessingAlgorithm,
+    QgsProcessingException,
+    QgsProcessingParameterBoolean,
+    QgsProcessingParameterExtent,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterNumber)
+
+from .settings import settings, epsg4326
+from .mgrsGrid import gzdRectangles, gridSquares
+from .mgrsgzd import StylePostProcessor
+from . import mgrs
+
+
+class MgrsSquaresAlgorithm(QgsProcessingAlgorithm):
+    """
+    Algorithm to create the MGRS 100 km grid square polygons of an area.
+    """
+    # Constants used to refer to parameters and outputs. They will be
+    # used when calling the algorithm from another algorithm, or when
+    # calling from the QGIS console.
+    PrmExtent = 'Extent'
+    PrmDensify = 'Densify'
+    PrmOutput = 'Output'
+    PrmStyle = 'Style'
+
+    def initAlgorithm(self, config):
+        self.addParameter(
+            QgsProcessingParameterExtent(
+                self.PrmExtent,
+                'Area of interest (the whole UTM area if not set)',
+                optional=True)
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.PrmDensify,
+                'Vertices added along each square edge',
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=10,
+                minValue=0,
+                maxValue=1000)
+        )
+        self.addParameter(
+            QgsProcessingParameterBoolean (
+                self.PrmStyle,
+                'Automatically style output',
+                True,
+                optional=True)
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.PrmOutput,
+                'MGRS 100 km grid squares')
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        densify = self.parameterAsInt(parameters, self.PrmDensify, context) + 1
+        auto_style = self.parameterAsBoolean(parameters, self.PrmStyle, context)
+        extent = QgsRectangle(-180, -80, 180, 84)
+        aoi = self.parameterAsExtent(parameters, self.PrmExtent, context, epsg4326)
+        if not aoi.isNull():
+            extent = extent.intersect(aoi)
+        if extent.isEmpty():
+            raise QgsProcessingException('The area of interest does not overlap the MGRS UTM area (80S to 84N)')
+
+        f = QgsFields()
+        f.append(QgsField("MGRS", QVariant.String))
+        f.append(QgsField("GZD", QVariant.String))
+        f.append(QgsField("square", QVariant.String))
+
+        (sink, dest_id) = self.parameterAsSink(
+            parameters, self.PrmOutput,
+            context, f, QgsWkbTypes.MultiPolygon, epsg4326)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.PrmOutput))
+
+        gzds = [g for g in gzdRectangles(False) if extent.intersects(QgsRectangle(*g[3:]))]
+        for i, (gzd, zone, band, xmin, ymin, xmax, ymax) in enumerate(gzds):
+            if feedback.isCanceled():
+                break
+            rect = extent.intersect(QgsRectangle(xmin, ymin, xmax, ymax))
+            if rect.width() <= 0 or rect.height() <= 0:
+                continue
+            sink.addFeatures(self.squareFeatures(zone, rect, densify), QgsFeatureSink.FastInsert)
+            feedback.setProgress(int(100.0 * (i + 1) / len(gzds)))
+
+        if auto_style:
+            if context.willLoadLayerOnCompletion(dest_id):
+                context.layerToLoadOnCompletionDetails(dest_id).setPostProcessor(StylePostProcessor.create(settings.lineColor, settings.fontColor, 'MGRS'))
+        return {self.PrmOutput: dest_id}
+
+    def squareFeatures(self, zone, rect, densify):
+        '''Return the features of the 100 km squares of one grid zone
+        designator, clipped to rect which lies within that zone.'''
+        hemisphere = 'N' if rect.yMinimum() >= 0 else 'S'
+        eastings, northings, lons, lats = gridSquares(
+            zone, hemisphere, rect.xMinimum(), rect.yMinimum(),
+            rect.xMaximum(), rect.yMaximum(), 100000, densify)
+        clip = QgsGeometry.fromRect(rect)
+        geoms = []
+        for x, y in zip(lons, lats):
+            if x.min() >= rect.xMaximum() or x.max() <= rect.xMinimum() or \
+                    y.min() >= rect.yMaximum() or y.max() <= rect.yMinimum():
+                continue
+            poly = QgsPolygon()
+            poly.setExteriorRing(QgsLineString(x.tolist(), y.tolist()))
+            geom = QgsGeometry(poly)
+            if not rect.contains(geom.boundingBox()):
+                # Clip the square at the zone and band edges
+                geom = geom.intersection(clip)
+                if geom.wkbType() == QgsWkbTypes.GeometryCollection:
+                    geom = QgsGeometry.collectGeometry(
+                        [g for g in geom.asGeometryCollection() if g.type() == QgsWkbTypes.PolygonGeometry])
+                if geom.isEmpty() or geom.area() <= 0:
+                    continue
+            geom.convertToMultiType()
+            geoms.append(geom)
+        if not geoms:
+            return []
+
+        # Label each square from a point within its clipped part so the band
+        # letter is that of the grid zone designator being built
+        points = [geom.pointOnSurface().asPoint() for geom in geoms]
+        ids = mgrs.toMgrsBatch([pt.y() for pt in points], [pt.x() for pt in points], 0)
+        features = []
+        for geom, square_id in zip(geoms, ids):
+            f = QgsFeature()
+            f.setGeometry(geom)
+            f.setAttributes([square_id, square_id[:3], square_id[3:]])
+            features.append(f)
+        return features
+
+    def name(self):
+        return 'mgrs100km'
+
+    def displayName(self):
+        return 'MGRS 100 km grid squares'
+
+    def helpUrl(self):
+        file = os.path.dirname(__file__) + '/index.html'
+        if not os.path.exists(file):
+            return ''
+        return QUrl.fromLocalFile(file).toString(QUrl.FullyEncoded)
+
+    def createInstance(self):
+        return MgrsSquaresAlgorithm()
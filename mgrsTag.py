@@ -0,0 +1,135 @@
+"""
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import itertools
+
+from qgis.PyQt.QtCore import QVariant
+from qgis.core import (
+    QgsCoordinateTransform,
+    QgsFeatureSink,
+    QgsField,
+    QgsProcessing,
+    QgsProcessingException,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterString)
+
+from .settings import epsg4326
+from .pointToMgrs import PointToMgrsAlgorithm
+from . import mgrs
+
+
+class MgrsTagAlgorithm(PointToMgrsAlgorithm):
+    """
+    Algorithm to add the MGRS grid zone designator and 100 km grid square
+    of each point to a point layer. They are computed from the coordinates,
+    so no spatial join with the grid zone designator polygons is needed.
+    """
+    PrmGzdField = 'GzdField'
+    PrmSquareField = 'SquareField'
+
+    def initAlgorithm(self, config):
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.PrmInput,
+                'Input point layer',
+                [QgsProcessing.TypeVectorPoint])
+        )
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.PrmGzdField,
+                'Grid zone designator field name (not added if empty)',
+                defaultValue='gzd',
+                optional=True)
+        )
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.PrmSquareField,
+                '100 km grid square field name (not added if empty)',
+                defaultValue='square',
+                optional=True)
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.PrmOutput,
+                'Output layer')
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.PrmInput, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.PrmInput))
+        gzd_field = self.parameterAsString(parameters, self.PrmGzdField, context).strip()
+        square_field = self.parameterAsString(parameters, self.PrmSquareField, context).strip()
+        if not gzd_field and not square_field:
+            raise QgsProcessingException('Enter a grid zone designator or 100 km grid square field name')
+
+        fields = source.fields()
+        if gzd_field:
+            fields.append(QgsField(gzd_field, QVariant.String))
+        if square_field:
+            fields.append(QgsField(square_field, QVariant.String))
+
+        (sink, dest_id) = self.parameterAsSink(
+            parameters, self.PrmOutput,
+            context, fields, source.wkbType(), source.sourceCrs())
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.PrmOutput))
+
+        if source.sourceCrs() == epsg4326:
+            transform = None
+        else:
+            transform = QgsCoordinateTransform(source.sourceCrs(), epsg4326, context.transformContext())
+
+        total = source.featureCount()
+        step = 100.0 / total if total > 0 else 0
+        failed = 0
+        done = 0
+        iterator = source.getFeatures()
+        while not feedback.isCanceled():
+            features = list(itertools.islice(iterator, self.ChunkSize))
+            if not features:
+                break
+            gzds = [None] * len(features)
+            squares = [None] * len(features)
+            valid, lats, lons = self.chunkCoordinates(features, transform)
+            failed += len(features) - len(valid)
+            if valid:
+                if gzd_field:
+                    for i, value in zip(valid, mgrs.gzdOf(lats, lons)):
+                        gzds[i] = value
+                if square_field:
+                    for i, value in zip(valid, self.encodeChunk(lats, lons, 0)):
+                        if value is None:
+                            failed += 1
+                        squares[i] = value
+            for feature, gzd, square in zip(features, gzds, squares):
+                attrs = feature.attributes()
+                if gzd_field:
+                    attrs.append(gzd)
+                if square_field:
+                    attrs.append(square)
+                feature.setAttributes(attrs)
+            sink.addFeatures(features, QgsFeatureSink.FastInsert)
+            done += len(features)
+            feedback.setProgress(int(done * step))
+
+        if failed:
+            feedback.pushInfo('{} features could not be tagged with MGRS values'.format(failed))
+        return {self.PrmOutput: dest_id}
+
+    def name(self):
+        return 'mgrstag'
+
+    def displayName(self):
+        return 'Add MGRS grid zone and 100 km square fields'
+
+    def createInstance(self):
+        return MgrsTagAlgorithm()
@@ -0,0 +1,168 @@
+"""
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import os
+import itertools
+
+from qgis.PyQt.QtCore import QVariant, QUrl
+from qgis.core import (
+    QgsFeature,
+    QgsFeatureSink,
+    QgsField,
+    QgsGeometry,
+    QgsPointXY,
+    QgsProcessing,
+    QgsProcessingAlgorithm,
+    QgsProcessingException,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterField,
+    QgsWkbTypes)
+
+from .settings import epsg4326
+from . import mgrs
+
+
+class MgrsToPointAlgorithm(QgsProcessingAlgorithm):
+    """
+    Algorithm to convert a table with an MGRS coordinate field to a point
+    layer. Rows that cannot be decoded are written to an error layer.
+    """
+    # Constants used to refer to parameters and outputs. They will be
+    # used when calling the algorithm from another algorithm, or when
+    # calling from the QGIS console.
+    PrmInput = 'Input'
+    PrmMgrsField = 'MgrsField'
+    PrmOutput = 'Output'
+    PrmErrors = 'Errors'
+
+    # Number of features read, decoded and written at a time
+    ChunkSize = 50000
+
+    def initAlgorithm(self, config):
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.PrmInput,
+                'Input layer or table',
+                [QgsProcessing.TypeVector])
+        )
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.PrmMgrsField,
+                'MGRS field',
+                parentLayerParameterName=self.PrmInput,
+                type=QgsProcessingParameterField.String)
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.PrmOutput,
+                'Output point layer',
+                QgsProcessing.TypeVectorPoint)
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.PrmErrors,
+                'Invalid MGRS coordinates',
+                QgsProcessing.TypeVector,
+                optional=True,
+                createByDefault=True)
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.PrmInput, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.PrmInput))
+        field_name = self.parameterAsString(parameters, self.PrmMgrsField, context)
+        field_index = source.fields().lookupField(field_name)
+        if field_index == -1:
+            raise QgsProcessingException('Field {} not found in the input layer'.format(field_name))
+
+        fields = source.fields()
+        (sink, dest_id) = self.parameterAsSink(
+            parameters, self.PrmOutput,
+            context, fields, QgsWkbTypes.Point, epsg4326)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.PrmOutput))
+
+        error_fields = source.fields()
+        error_fields.append(QgsField('error', QVariant.String))
+        (error_sink, error_id) = self.parameterAsSink(
+            parameters, self.PrmErrors,
+            context, error_fields, QgsWkbTypes.NoGeometry)
+
+        total = source.featureCount()
+        step = 100.0 / total if total > 0 else 0
+        failed = 0
+        done = 0
+        iterator = source.getFeatures()
+        while not feedback.isCanceled():
+            chunk = list(itertools.islice(iterator, self.ChunkSize))
+            if not chunk:
+                break
+            values = []
+            for feature in chunk:
+                value = feature[field_index]
+                values.append(value if isinstance(value, str) else None)
+            lats, lons, valid = mgrs.toWgsBatch(values)
+
+            features = []
+            errors = []
+            for i, feature in enumerate(chunk):
+                if valid[i]:
+                    f = QgsFeature()
+                    f.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(float(lons[i]), float(lats[i]))))
+                    f.setAttributes(feature.attributes())
+                    features.append(f)
+                else:
+                    failed += 1
+                    if error_sink is not None:
+                        f = QgsFeature()
+                        f.setAttributes(feature.attributes() + [self.errorReason(values[i])])
+                        errors.append(f)
+            sink.addFeatures(features, QgsFeatureSink.FastInsert)
+            if errors:
+                error_sink.addFeatures(errors, QgsFeatureSink.FastInsert)
+            done += len(chunk)
+            feedback.setProgress(int(done * step))
+
+        if failed:
+            feedback.pushInfo('{} rows had an invalid MGRS coordinate'.format(failed))
+        results = {self.PrmOutput: dest_id}
+        if error_sink is not None:
+            results[self.PrmErrors] = error_id
+        return results
+
+    def errorReason(self, value):
+        '''Return why an MGRS value could not be decoded. Only called for
+        the invalid rows, so the scalar decoder is used to get the message.'''
+        if value is None or not value.strip():
+            return 'Empty MGRS value'
+        try:
+            mgrs.toWgs(value)
+        except mgrs.MgrsException as e:
+            return str(e)
+        except Exception:
+            pass
+        return mgrs.BADLY_FORMED
+
+    def name(self):
+        return 'mgrs2point'
+
+    def displayName(self):
+        return 'MGRS field to point layer'
+
+    def helpUrl(self):
+        file = os.path.dirname(__file__) + '/index.html'
+        if not os.path.exists(file):
+            return ''
+        return QUrl.fromLocalFile(file).toString(QUrl.FullyEncoded)
+
+    def createInstance(self):
+        return MgrsToPointAlgorithm()
@@ -9,30 +9,50 @@
  ***************************************************************************/
 """
 import os
+import threading
 
 from qgis.PyQt.QtCore import Qt, QVariant, QUrl
 from qgis.PyQt.QtGui import QIcon
-from qgis.core import QgsFields, QgsField, QgsFeature, QgsWkbTypes, QgsRectangle, QgsGeometry, QgsVectorLayer, QgsPalLayerSettings, QgsVectorLayerSimpleLabeling
+from qgis.core import QgsFields, QgsField, QgsFeature, QgsFeatureSink, QgsWkbTypes, QgsRectangle, QgsGeometry, QgsVectorLayer, QgsPalLayerSettings, QgsVectorLayerSimpleLabeling
 from qgis.utils import iface
 
 from qgis.core import (
     QgsProcessingAlgorithm,
+    QgsProcessingException,
     QgsProcessingParameterBoolean,
+    QgsProcessingParameterExtent,
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterFeatureSink)
 
 from .settings import settings, epsg4326
-
-bands = ['C','D','E','F','G','H','J','K','L','M','N','P','Q','R','S','T','U','V','W','X']
+from .mgrsGrid import gzdRectangles
+
+_gzdGeometries = None
+_gzdLock = threading.Lock()
+
+def gzdGeometries():
+    '''Return the grid zone designator polygons as a list of
+    (gzd, zone, QgsRectangle, QgsGeometry) tuples. They are built on the
+    first call and shared by later runs of the algorithm.'''
+    global _gzdGeometries
+    with _gzdLock:
+        if _gzdGeometries is None:
+            geoms = []
+            for gzd, zone, band, xmin, ymin, xmax, ymax in gzdRectangles(True):
+                rect = QgsRectangle(xmin, ymin, xmax, ymax)
+                geoms.append((gzd, zone, rect, QgsGeometry.fromRect(rect)))
+            _gzdGeometries = geoms
+        return _gzdGeometries
 
 class MgrsGzdAlgorithm(QgsProcessingAlgorithm):
     """
-    Algorithm to convert a point layer to a MGRS field.
+    Algorithm to create the MGRS grid zone designator polygons.
     """
     # Constants used to refer to parameters and outputs. They will be
     # used when calling the algorithm from another algorithm, or when
     # calling from the QGIS console.
     PrmPolarRegions = 'Polar'
+    PrmExtent = 'Extent'
     PrmOutput = 'Output'
     PrmStyle = 'Style'
 
@@ -44,6 +64,12 @@ class MgrsGzdAlgorithm(QgsProcessingAlgorithm):
                 True,
                 optional=False)
         )
+        self.addParameter(
+            QgsProcessingParameterExtent(
+                self.PrmExtent,
+                'Area of interest (the whole world if not set)',
+                optional=True)
+        )
         self.addParameter(
             QgsProcessingParameterBoolean (
                 self.PrmStyle,
@@ -60,6 +86,7 @@ class MgrsGzdAlgorithm(QgsProcessingAlgorithm):
     def processAlgorithm(self, parameters, context, feedback):
         polar = self.parameterAsBoolean(parameters, self.PrmPolarRegions, context)
         auto_style = self.parameterAsBoolean(parameters, self.PrmStyle, context)
+        extent = self.parameterAsExtent(parameters, self.PrmExtent, context, epsg4326)
 
         f = QgsFields()
         f.append(QgsField("GZD", QVariant.String))
@@ -67,63 +94,30 @@ class MgrsGzdAlgorithm(QgsProcessingAlgorithm):
         (sink, dest_id) = self.parameterAsSink(
             parameters, self.PrmOutput,
             context, f, QgsWkbTypes.Polygon, epsg4326)
-        if polar:
-            self.exportPolygon(sink, -180, -90, 180, 10, 'A')
-            self.exportPolygon(sink, 0, -90, 180, 10, 'B')
-        lat = -80
-        for b in bands:
-            if b == 'X':
-                height = 12
-                lon = -180
-                for i in range(1, 31):
-                    gzd = '{:02d}{}'.format(i, b)
-                    width = 6
-                    self.exportPolygon(sink, lon, lat, width, height, gzd)
-                    lon += width
-                self.exportPolygon(sink, lon, lat, 9, height, '31X')
-                lon += 9
-                self.exportPolygon(sink, lon, lat, 12, height, '33X')
-                lon += 12
-                self.exportPolygon(sink, lon, lat, 12, height, '35X')
-                lon += 12
-                self.exportPolygon(sink, lon, lat, 9, height, '37X')
-                lon += 9
-                for i in range(38, 61):
-                    gzd = '{:02d}{}'.format(i, b)
-                    width = 6
-                    self.exportPolygon(sink, lon, lat, width, height, gzd)
-                    lon += width
-            else:
-                height = 8
-                lon = -180
-                for i in range(1, 61):
-                    gzd = '{:02d}{}'.format(i, b)
-                    if b == 'V' and i == 31:
-                        width = 3
-                    elif b == 'V' and i == 32:
-                        width = 9
-                    else:
-                        width = 6
-                    self.exportPolygon(sink, lon, lat, width, height, gzd)
-                    lon += width
-            lat += height
-
-        if polar:
-            self.exportPolygon(sink, -180, 84, 180, 6, 'Y')
-            self.exportPolygon(sink, 0, 84, 180, 6, 'Z')
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.PrmOutput))
+
+        gzds = gzdGeometries()
+        features = []
+        for i, (gzd, zone, rect, geom) in enumerate(gzds):
+            if i % 100 == 0:
+                if feedback.isCanceled():
+                    return {self.PrmOutput: dest_id}
+                feedback.setProgress(int(50.0 * i / len(gzds)))
+            if (zone == 0 and not polar) or (not extent.isNull() and not extent.intersects(rect)):
+                continue
+            feat = QgsFeature()
+            feat.setGeometry(geom)
+            feat.setAttributes([gzd])
+            features.append(feat)
+        sink.addFeatures(features, QgsFeatureSink.FastInsert)
+        feedback.setProgress(100)
 
         if auto_style:
             if context.willLoadLayerOnCompletion(dest_id):
                 context.layerToLoadOnCompletionDetails(dest_id).setPostProcessor(StylePostProcessor.create(settings.lineColor, settings.fontColor))
         return {self.PrmOutput: dest_id}
 
-    def exportPolygon(self, sink, lon, lat, width, height, gzd):
-        rect = QgsRectangle(lon, lat, lon+width, lat+height)
-        f = QgsFeature()
-        f.setGeometry(QgsGeometry.fromRect(rect))
-        f.setAttributes([gzd])
-        sink.addFeature(f)
-
     def name(self):
         return 'mgrsgzd'
 
@@ -144,10 +138,12 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
     instance = None
     line_color = None
     font_color = None
+    label_field = None
 
-    def __init__(self, line_color, font_color):
+    def __init__(self, line_color, font_color, label_field='GZD'):
         self.line_color = line_color
         self.font_color = font_color
+        self.label_field = label_field
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
@@ -158,7 +154,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         sym.setBrushStyle(Qt.NoBrush)
         sym.setStrokeColor(self.line_color)
         label = QgsPalLayerSettings()
-        label.fieldName = 'GZD'
+        label.fieldName = self.label_field
         format = label.format()
         format.setColor(self.font_color)
         format.setSize(8)
@@ -170,11 +166,11 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
 
     # Hack to work around sip bug!
     @staticmethod
-    def create(line_color, font_color) -> 'StylePostProcessor':
+    def create(line_color, font_color, label_field='GZD') -> 'StylePostProcessor':
         """
         Returns a new instance of the post processor, keeping a reference to the sip
         wrapper so that sip doesn't get confused with the Python subclass and call
         the base wrapper implementation instead... ahhh sip, you wonderful piece of sip
         """
-        StylePostProcessor.instance = StylePostProcessor(line_color, font_color)
+        StylePostProcessor.instance = StylePostProcessor(line_color, font_color, label_field)
         return StylePostProcessor.instance
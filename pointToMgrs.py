@@ -0,0 +1,202 @@
+"""
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import os
+import itertools
+
+from qgis.PyQt.QtCore import QVariant, QUrl
+from qgis.core import (
+    QgsCoordinateTransform,
+    QgsCsException,
+    QgsFeatureSink,
+    QgsField,
+    QgsGeometry,
+    QgsProcessing,
+    QgsProcessingAlgorithm,
+    QgsProcessingException,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterNumber,
+    QgsProcessingParameterString)
+
+from .settings import epsg4326
+from . import mgrs
+
+
+class PointToMgrsAlgorithm(QgsProcessingAlgorithm):
+    """
+    Algorithm to add an MGRS coordinate field to a point layer.
+    """
+    # Constants used to refer to parameters and outputs. They will be
+    # used when calling the algorithm from another algorithm, or when
+    # calling from the QGIS console.
+    PrmInput = 'Input'
+    PrmFieldName = 'FieldName'
+    PrmPrecision = 'Precision'
+    PrmOutput = 'Output'
+
+    # Number of features read, converted and written at a time
+    ChunkSize = 50000
+
+    def initAlgorithm(self, config):
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.PrmInput,
+                'Input point layer',
+                [QgsProcessing.TypeVectorPoint])
+        )
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.PrmFieldName,
+                'MGRS field name',
+                defaultValue='mgrs')
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.PrmPrecision,
+                'MGRS precision',
+                QgsProcessingParameterNumber.Integer,
+                defaultValue=5,
+                minValue=0,
+                maxValue=5)
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.PrmOutput,
+                'Output layer')
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.PrmInput, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.PrmInput))
+        field_name = self.parameterAsString(parameters, self.PrmFieldName, context).strip()
+        precision = self.parameterAsInt(parameters, self.PrmPrecision, context)
+
+        fields = source.fields()
+        fields.append(QgsField(field_name, QVariant.String))
+
+        (sink, dest_id) = self.parameterAsSink(
+            parameters, self.PrmOutput,
+            context, fields, source.wkbType(), source.sourceCrs())
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.PrmOutput))
+
+        if source.sourceCrs() == epsg4326:
+            transform = None
+        else:
+            transform = QgsCoordinateTransform(source.sourceCrs(), epsg4326, context.transformContext())
+
+        total = source.featureCount()
+        step = 100.0 / total if total > 0 else 0
+        failed = 0
+        done = 0
+        iterator = source.getFeatures()
+        while not feedback.isCanceled():
+            features = list(itertools.islice(iterator, self.ChunkSize))
+            if not features:
+                break
+            values = self.convertChunk(features, transform, precision)
+            for feature, value in zip(features, values):
+                if value is None:
+                    failed += 1
+                feature.setAttributes(feature.attributes() + [value])
+            sink.addFeatures(features, QgsFeatureSink.FastInsert)
+            done += len(features)
+            feedback.setProgress(int(done * step))
+
+        if failed:
+            feedback.pushInfo('{} features could not be converted to MGRS'.format(failed))
+        return {self.PrmOutput: dest_id}
+
+    def convertChunk(self, features, transform, precision):
+        '''Return the MGRS strings of a chunk of point features, None where a
+        feature has no geometry or a coordinate outside of the MGRS range.'''
+        values = [None] * len(features)
+        valid, lats, lons = self.chunkCoordinates(features, transform)
+        if valid:
+            for i, value in zip(valid, self.encodeChunk(lats, lons, precision)):
+                values[i] = value
+        return values
+
+    def encodeChunk(self, lats, lons, precision):
+        '''Return the MGRS strings of a chunk of coordinates, None for the
+        points that cannot be encoded.'''
+        return [value.strip() if value is not None else None
+                for value in mgrs.iterToMgrs(zip(lats, lons), precision, len(lats), errors='none')]
+
+    def chunkCoordinates(self, features, transform):
+        '''Return the indices of the features of a chunk that have a point
+        within the MGRS range, with the latitudes and longitudes of those
+        points. The points of the whole chunk are transformed with one call
+        by gathering them in a single multipoint geometry.'''
+        index = []
+        points = []
+        for i, feature in enumerate(features):
+            geom = feature.geometry()
+            if geom.isNull() or geom.isEmpty():
+                continue
+            if geom.isMultipart():
+                points.append(geom.asMultiPoint()[0])
+            else:
+                points.append(geom.asPoint())
+            index.append(i)
+
+        lons = []
+        lats = []
+        valid = []
+        if not points:
+            return valid, lats, lons
+        if transform is not None:
+            points = self.transformPoints(points, transform)
+
+        for i, pt in zip(index, points):
+            if pt is None:
+                continue
+            lon = pt.x()
+            lat = pt.y()
+            if -90 <= lat <= 90 and -180 <= lon <= 360:
+                lons.append(lon)
+                lats.append(lat)
+                valid.append(i)
+        return valid, lats, lons
+
+    def transformPoints(self, points, transform):
+        '''Transform a list of QgsPointXY in one call. If the chunk cannot be
+        transformed as a whole, fall back to transforming the points one by
+        one, returning None for those that fail.'''
+        geom = QgsGeometry.fromMultiPointXY(points)
+        try:
+            geom.transform(transform)
+            return geom.asMultiPoint()
+        except QgsCsException:
+            pass
+        result = []
+        for pt in points:
+            try:
+                result.append(transform.transform(pt))
+            except QgsCsException:
+                result.append(None)
+        return result
+
+    def name(self):
+        return 'point2mgrs'
+
+    def displayName(self):
+        return 'Point layer to MGRS'
+
+    def helpUrl(self):
+        file = os.path.dirname(__file__) + '/index.html'
+        if not os.path.exists(file):
+            return ''
+        return QUrl.fromLocalFile(file).toString(QUrl.FullyEncoded)
+
+    def createInstance(self):
+        return PointToMgrsAlgorithm()
@@ -12,6 +12,12 @@ import os
 from qgis.core import QgsProcessingProvider
 from qgis.PyQt.QtGui import QIcon
 from .mgrsgzd import MgrsGzdAlgorithm
+from .pointToMgrs import PointToMgrsAlgorithm
+from .mgrsToPoint import MgrsToPointAlgorithm
+from .mgrsSquares import MgrsSquaresAlgorithm
+from .mgrsTag import MgrsTagAlgorithm
+from .mgrsCells import MgrsCellsAlgorithm
+from .mgrsAggregate import MgrsAggregateAlgorithm
 
 
 class MGRSProvider(QgsProcessingProvider):
@@ -21,6 +27,12 @@ class MGRSProvider(QgsProcessingProvider):
 
     def loadAlgorithms(self):
         self.addAlgorithm(MgrsGzdAlgorithm())
+        self.addAlgorithm(PointToMgrsAlgorithm())
+        self.addAlgorithm(MgrsToPointAlgorithm())
+        self.addAlgorithm(MgrsSquaresAlgorithm())
+        self.addAlgorithm(MgrsTagAlgorithm())
+        self.addAlgorithm(MgrsCellsAlgorithm())
+        self.addAlgorithm(MgrsAggregateAlgorithm())
 
     def icon(self):
         return QIcon(os.path.dirname(__file__) + '/images/copyMgrs.svg')
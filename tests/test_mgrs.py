@@ -0,0 +1,89 @@
+"""
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+
+Tests of the mgrs.py conversions. They run without QGIS:
+
+    python -m pytest tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import mgrs  # noqa: E402
+
+
+class UpsDecodingTest(unittest.TestCase):
+
+    def testBatchRejectsNonPolarFirstLetter(self):
+        strings = ['CYD5181', 'DZH1234', 'CAB', 'DZA']
+        latitude, longitude, valid = mgrs.toWgsBatch(strings)
+        self.assertFalse(valid.any())
+        for s in strings:
+            self.assertRaises(mgrs.MgrsException, mgrs.toWgs, s)
+            self.assertFalse(mgrs.isValid(s))
+
+    def testBatchMatchesScalar(self):
+        strings = ['AZA', 'BAN', 'YZH12', 'ZAG5181', 'CYD5181']
+        latitude, longitude, valid = mgrs.toWgsBatch(strings)
+        for s, lat, lon, ok in zip(strings, latitude, longitude, valid):
+            if ok:
+                expected = mgrs.toWgs(s)
+                self.assertAlmostEqual(lat, expected[0], 9)
+                self.assertAlmostEqual(lon, expected[1], 9)
+            else:
+                self.assertRaises(mgrs.MgrsException, mgrs.toWgs, s)
+
+    def testCellBoundsRejectsNonPolarFirstLetter(self):
+        self.assertEqual(mgrs.cellBounds(['CYD5181', 'DZH1']), [None, None])
+        self.assertEqual(list(mgrs.iterToWgs(['CYD5181'], errors='none')), [None])
+
+
+class UtmUpsBoundaryTest(unittest.TestCase):
+
+    def testEdgeLatitudesAreUtm(self):
+        self.assertTrue(mgrs.toMgrs(-80, 42).startswith('38C'))
+        self.assertTrue(mgrs.toMgrs(84, 10).startswith('33X'))
+        self.assertEqual(mgrs.gzdOf(84, 10), '33X')
+
+    def testBatchMatchesScalarOnEdges(self):
+        latitudes = [lat for lat in (-80, 84) for _ in range(0, 360, 7)]
+        longitudes = [lon for _ in (-80, 84) for lon in range(-180, 180, 7)]
+        self.assertEqual(
+            mgrs.toMgrsBatch(latitudes, longitudes, 3),
+            [mgrs.toMgrs(lat, lon, 3) for lat, lon in zip(latitudes, longitudes)])
+        self.assertNotIn(None, list(mgrs.iterToMgrs(
+            zip(latitudes, longitudes), errors='none')))
+
+
+class PolarCellBoundsTest(unittest.TestCase):
+
+    def testRingIsContinuousAcrossAntimeridian(self):
+        for s in ['YZH', 'AZA', 'YZH9999']:
+            ring = mgrs.cellBounds([s])[0]
+            self.assertEqual(ring[0], ring[-1])
+            for (x0, y0), (x1, y1) in zip(ring, ring[1:]):
+                self.assertLessEqual(abs(x1 - x0), 180.0, s)
+
+    def testCellTouchingPoleFollowsPoleLine(self):
+        for s, pole in [('ZAG', 90.0), ('YZH', 90.0), ('AZN', -90.0), ('BAN', -90.0)]:
+            ring = mgrs.cellBounds([s])[0]
+            onPole = [x for x, y in ring if y == pole]
+            self.assertEqual(len(onPole), 2, s)
+            self.assertAlmostEqual(abs(onPole[0] - onPole[1]), 90.0, 6, s)
+
+    def testRingAroundPoleIsClosedAlongPoleLine(self):
+        ring = [(lon, 85.0) for lon in range(-180, 180, 60)]
+        result = mgrs._polarRing(ring, [False] * len(ring), True)
+        self.assertEqual(result[-2:], [(180.0, 90.0), (-180.0, 90.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,6 @@
  ***************************************************************************/
 """
 import os
-import re
 
 from qgis.PyQt.uic import loadUiType
 from qgis.PyQt.QtGui import QIcon
@@ -48,9 +47,8 @@ class ZoomToMgrs(QDockWidget, FORM_CLASS):
         
     def zoomToPressed(self):
         try:
-            text = self.coordTxt.text().strip()
-            text2 = re.sub(r'\s+', '', str(text))
-            lat, lon = mgrs.toWgs(text2)
+            coord = mgrs.parse(self.coordTxt.text())
+            lat, lon = mgrs.toWgs(coord)
             pt = self.zoomTo(epsg4326, lat, lon)
             if settings.persistentMarker:
                 if self.marker is None: